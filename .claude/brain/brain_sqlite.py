@@ -172,6 +172,7 @@ class BrainSQLite:
         self._chroma_client = None
         self._chroma_collection = None
         self._use_chromadb = False
+        self._vector_store_ready = False  # True once a backend is settled
         self._npz_embeddings: Dict[str, Any] = {}  # fallback numpy store
         self._embeddings_dirty = False
 
@@ -233,9 +234,15 @@ class BrainSQLite:
 
     def _ensure_vector_store(self):
         """Initialize vector store: ChromaDB (primary) or npz fallback."""
+        # Single-boolean fast path: every embedding operation calls this
+        # defensively, so the no-op case must cost one attribute check.
+        if self._vector_store_ready:
+            return
         if self._use_chromadb:
+            self._vector_store_ready = True
             return  # already initialized
         if self._npz_embeddings:
+            self._vector_store_ready = True
             return  # fallback already loaded
 
         # Try ChromaDB first
@@ -251,6 +258,7 @@ class BrainSQLite:
                     metadata={"hnsw:space": "cosine"}
                 )
                 self._use_chromadb = True
+                self._vector_store_ready = True
                 count = self._chroma_collection.count()
                 if count > 0:
                     sys.stderr.write(f"Loaded: {count} embeddings (ChromaDB)\n")
@@ -269,6 +277,7 @@ class BrainSQLite:
             try:
                 loaded = np.load(emb_file)
                 self._npz_embeddings = {k: loaded[k] for k in loaded.files}
+                self._vector_store_ready = True
                 sys.stderr.write(f"Loaded: {len(self._npz_embeddings)} embeddings (npz)\n")
             except Exception as e:
                 print(f"Error loading embeddings: {e}")
@@ -290,6 +299,24 @@ class BrainSQLite:
             self._npz_embeddings[node_id] = np.array(embedding)
             self._embeddings_dirty = True
 
+    def _store_embeddings_batch(self, node_ids: List[str], embeddings: List[Any]):
+        """Store many embeddings in one vector-store round trip.
+
+        ChromaDB upsert accepts batches; sending N vectors in one call is far
+        cheaper than N single-vector upserts.
+        """
+        if not node_ids:
+            return
+        self._ensure_vector_store()
+        if self._use_chromadb and self._chroma_collection is not None:
+            emb_lists = [e.tolist() if hasattr(e, 'tolist') else list(e)
+                         for e in embeddings]
+            self._chroma_collection.upsert(ids=list(node_ids), embeddings=emb_lists)
+        elif HAS_NUMPY:
+            for node_id, embedding in zip(node_ids, embeddings):
+                self._npz_embeddings[node_id] = np.array(embedding)
+            self._embeddings_dirty = True
+
     def _generate_embedding(self, title: str, content: str, labels: List[str]):
         """Generate embedding inline. Returns None silently if deps unavailable."""
         if not HAS_NUMPY:
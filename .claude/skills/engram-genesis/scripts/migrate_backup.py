@@ -11,24 +11,134 @@ Usage:
 """
 
 import argparse
+import concurrent.futures
 import json
 import os
 import re
 import shutil
 import sys
+import threading
 from datetime import datetime
 from pathlib import Path
 from typing import Optional
 
+# Optional fast path: orjson parses/serializes bytes directly (no str
+# round-trip). Falls back to stdlib json transparently.
+try:
+    import orjson
+
+    _json_loads = orjson.loads
+
+    def _json_dumps(obj) -> bytes:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2)
+except ImportError:
+    _json_loads = json.loads
+
+    def _json_dumps(obj) -> bytes:
+        return json.dumps(obj, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+# Compiled once at import — repeated re.search/findall with literal patterns
+# pays pattern-cache lookup (and recompiles once the LRU cache overflows).
+_PROJECT_NAME_RE = re.compile(r"^#\s*(?:Projeto:|Project:)?\s*(.+)$", re.MULTILINE)
+_RULES_SECTION_RE = re.compile(r"(?:Ao Codificar|Coding Rules|Rules).*?\n((?:[-*].*\n)+)", re.IGNORECASE | re.DOTALL)
+_STACK_SECTION_RE = re.compile(r"##\s*Stack\n((?:[-*].*\n)+)")
+_H2_RE = re.compile(r"^##\s*(.+)$", re.MULTILINE)
+# _H2_RE tolerates ### lines (\s* matches zero); boundaries must not, or a
+# custom section gets truncated at its first subheading.
+_H2_BOUNDARY_RE = re.compile(r"##\s")
+_PAREN_RE = re.compile(r"\s*\(.*\)")
+
+# Entry patterns capture both the full block (group 1) and its id (group 2)
+# so dedup needs no second regex pass per entry.
+_EXP_ENTRY_RE = re.compile(r"(##\s*(EXP-\d+)[^\n]*\n(?:(?!##).*\n)*)")
+_EXP_ID_RE = re.compile(r"##\s*(EXP-\d+)")
+_PAT_ENTRY_RE = re.compile(r"(###\s*(PAT-\d+)[^\n]*\n(?:(?!###).*\n)*)")
+_PAT_ID_RE = re.compile(r"###\s*(PAT-\d+)")
+_ADR_ENTRY_RE = re.compile(r"(##\s*(ADR-\d+)[^\n]*\n(?:(?!##\s*ADR).*\n)*)")
+_ADR_ID_RE = re.compile(r"##\s*(ADR-\d+)")
+_DOMAIN_TERM_RE = re.compile(r"(-\s*\*\*([^*]+)\*\*:[^\n]+)")
+_DOMAIN_EXISTING_RE = re.compile(r"-\s*\*\*([^*]+)\*\*:")
+
+# Markers indicating auto-generated/empty template content. Single alternation
+# so one C-level scan replaces a Python-level `any(marker in ...)` cascade.
+_TEMPLATE_MARKERS_RE = re.compile(
+    r"\[TODO:|\[A definir\]|\[Auto-detectado\]|\[Vazio\]|"
+    r"Pendente análise|rode /init-engram|será populada pelo"
+)
+
+# Built once at import — these were set literals rebuilt (allocated + hashed)
+# on every call. frozenset keeps O(1) membership without per-call cost;
+# plain tuples for the token lists we only iterate.
+_CORE_SKILLS = frozenset({
+    "engram-genesis", "engram-evolution", "project-analyzer",
+    "knowledge-manager", "domain-expert", "priority-engine",
+    "code-reviewer", "engram-factory"
+})
+_CORE_COMMANDS = frozenset({
+    "commit", "create", "curriculum", "doctor", "export", "import",
+    "init-engram", "learn", "plan", "priorities", "review", "spawn", "status"
+})
+_CORE_AGENTS = frozenset({"architect", "domain-analyst", "db-expert"})
+
+# Standard permissions from setup.sh template
+_STANDARD_ALLOW = frozenset({
+    "Read", "Write", "Edit", "Glob", "Grep",
+    "Bash(git add:*)", "Bash(git status:*)", "Bash(git commit:*)",
+    "Bash(git log:*)", "Bash(git diff:*)", "Bash(git branch:*)",
+    "Bash(cat:*)", "Bash(ls:*)", "Bash(find:*)", "Bash(grep:*)",
+    "Bash(head:*)", "Bash(tail:*)", "Bash(wc:*)", "Bash(mkdir:*)",
+    "Bash(echo:*)", "Bash(python3:*)", "Bash(npx:*)",
+    "Bash(docker compose:*)"
+})
+_STANDARD_DENY = frozenset({
+    "Bash(rm -rf /)*",
+    "Read(.env)", "Read(.env.local)", "Read(.env.production)"
+})
+_PM_TOKENS = ("pnpm", "yarn", "bun", "npm run")
+
+_GENERIC_RULE_TOKENS = (
+    "validação de input", "error handling", "nunca any", "server components"
+)
+_STANDARD_SECTIONS = frozenset({
+    "identidade", "princípio central", "workflow obrigatório",
+    "antes de codificar", "ao codificar", "depois de codificar",
+    "stack", "auto-geração", "skills disponíveis", "subagentes",
+    "orquestração inteligente", "regras de ouro"
+})
+
+# Interned once so every recommendation dict shares the same key/value
+# objects — cached hashes and fewer short-lived strings when hundreds of
+# recommendations get built and JSON-dumped.
+_K_TYPE = sys.intern("type")
+_K_ACTION = sys.intern("action")
+_K_DESCRIPTION = sys.intern("description")
+_K_PRIORITY = sys.intern("priority")
+_K_FILE = sys.intern("file")
+_V_MERGE = sys.intern("merge")
+_V_PRESERVE = sys.intern("preserve")
+_V_HIGH = sys.intern("high")
+_V_MEDIUM = sys.intern("medium")
+
+# Knowledge files whose merges are high priority (hard-won project memory)
+_HIGH_PRIORITY_TOKENS = ("EXPERIENCE", "PATTERN")
+
+
+def _is_high_prio(key: str) -> bool:
+    return any(token in key for token in _HIGH_PRIORITY_TOKENS)
+
 
 # ══════════════════════════════════════════════════════════════════════════════
 # DETECTION
 # ══════════════════════════════════════════════════════════════════════════════
 
-def detect_backups(project_dir: str) -> dict:
+def detect_backups(project_dir: str, quick: bool = False) -> dict:
     """
     Detect backup files/directories created by setup.sh.
 
+    With quick=True, returns right after the existence checks — no
+    enumeration of knowledge/skills/commands/agents (O(1) syscalls).
+
     Returns dict with:
         - found: bool (any backup exists)
         - claude_dir_bak: path or None
@@ -52,70 +162,70 @@ def detect_backups(project_dir: str) -> dict:
         "custom_agents": [],
     }
 
-    # Check .claude.bak/
+    # Cheap existence checks first so quick mode stays O(1) syscalls
     claude_bak = p / ".claude.bak"
-    if claude_bak.is_dir():
+    if os.path.isdir(claude_bak):
         result["found"] = True
         result["claude_dir_bak"] = str(claude_bak)
 
+    claude_md_bak = p / "CLAUDE.md.bak"
+    if os.path.isfile(claude_md_bak):
+        result["found"] = True
+        result["claude_md_bak"] = str(claude_md_bak)
+
+    if quick:
+        return result
+
+    if result["claude_dir_bak"]:
         # Check manifest
         manifest_bak = claude_bak / "manifest.json"
-        if manifest_bak.is_file():
+        if os.path.isfile(manifest_bak):
             result["manifest_bak"] = str(manifest_bak)
 
         # Check settings
         settings_bak = claude_bak / "settings.json"
-        if settings_bak.is_file():
+        if os.path.isfile(settings_bak):
             result["settings_bak"] = str(settings_bak)
 
-        # Check knowledge files
-        knowledge_dir = claude_bak / "knowledge"
-        if knowledge_dir.is_dir():
+        # Check knowledge files — os.scandir over Path.glob: DirEntry gives
+        # name/type without extra stat syscalls or per-entry Path objects
+        knowledge_dir = os.path.join(str(claude_bak), "knowledge")
+        if os.path.isdir(knowledge_dir):
             for subdir in ["context", "priorities", "patterns", "decisions", "domain", "experiences"]:
-                subpath = knowledge_dir / subdir
-                if subpath.is_dir():
-                    for f in subpath.glob("*.md"):
-                        key = f"{subdir}/{f.name}"
-                        result["knowledge_bak"][key] = str(f)
+                subpath = os.path.join(knowledge_dir, subdir)
+                if os.path.isdir(subpath):
+                    with os.scandir(subpath) as it:
+                        for de in it:
+                            if de.name.endswith(".md") and de.is_file(follow_symlinks=False):
+                                result["knowledge_bak"][f"{subdir}/{de.name}"] = de.path
 
         # Check for custom skills (non-core)
-        core_skills = {
-            "engram-genesis", "engram-evolution", "project-analyzer",
-            "knowledge-manager", "domain-expert", "priority-engine",
-            "code-reviewer", "engram-factory"
-        }
         skills_dir = claude_bak / "skills"
-        if skills_dir.is_dir():
-            for skill in skills_dir.iterdir():
-                if skill.is_dir() and skill.name not in core_skills:
-                    result["custom_skills"].append(skill.name)
+        if os.path.isdir(skills_dir):
+            with os.scandir(skills_dir) as it:
+                for de in it:
+                    if de.is_dir(follow_symlinks=False) and de.name not in _CORE_SKILLS:
+                        result["custom_skills"].append(de.name)
 
         # Check for custom commands
-        core_commands = {
-            "commit", "create", "curriculum", "doctor", "export", "import",
-            "init-engram", "learn", "plan", "priorities", "review", "spawn", "status"
-        }
         commands_dir = claude_bak / "commands"
-        if commands_dir.is_dir():
-            for cmd in commands_dir.glob("*.md"):
-                name = cmd.stem
-                if name not in core_commands:
-                    result["custom_commands"].append(name)
+        if os.path.isdir(commands_dir):
+            with os.scandir(commands_dir) as it:
+                for de in it:
+                    if de.name.endswith(".md") and de.is_file(follow_symlinks=False):
+                        name = de.name[:-3]
+                        if name not in _CORE_COMMANDS:
+                            result["custom_commands"].append(name)
 
         # Check for custom agents
-        core_agents = {"architect", "domain-analyst", "db-expert"}
         agents_dir = claude_bak / "agents"
-        if agents_dir.is_dir():
-            for agent in agents_dir.glob("*.md"):
-                name = agent.stem
-                if name not in core_agents:
-                    result["custom_agents"].append(name)
-
-    # Check CLAUDE.md.bak
-    claude_md_bak = p / "CLAUDE.md.bak"
-    if claude_md_bak.is_file():
-        result["found"] = True
-        result["claude_md_bak"] = str(claude_md_bak)
+        if os.path.isdir(agents_dir):
+            with os.scandir(agents_dir) as it:
+                for de in it:
+                    if de.name.endswith(".md") and de.is_file(follow_symlinks=False):
+                        name = de.name[:-3]
+                        if name not in _CORE_AGENTS:
+                            result["custom_agents"].append(name)
 
     return result
 
@@ -135,29 +245,23 @@ def analyze_claude_md_bak(path: str) -> dict:
     }
 
     # Extract project name
-    name_match = re.search(r"^#\s*(?:Projeto:|Project:)?\s*(.+)$", content, re.MULTILINE)
+    name_match = _PROJECT_NAME_RE.search(content)
     if name_match:
         analysis["project_name"] = name_match.group(1).strip()
 
     # Extract custom rules (lines starting with - in "Ao Codificar" or similar sections)
-    rules_section = re.search(
-        r"(?:Ao Codificar|Coding Rules|Rules).*?\n((?:[-*].*\n)+)",
-        content, re.IGNORECASE | re.DOTALL
-    )
+    rules_section = _RULES_SECTION_RE.search(content)
     if rules_section:
         for line in rules_section.group(1).split("\n"):
             line = line.strip()
             if line.startswith(("-", "*")) and len(line) > 10:
                 rule = line.lstrip("-* ").strip()
                 # Skip generic rules that come from template
-                if not any(generic in rule.lower() for generic in [
-                    "validação de input", "error handling", "nunca any",
-                    "server components"
-                ]):
+                if not any(generic in rule.lower() for generic in _GENERIC_RULE_TOKENS):
                     analysis["custom_rules"].append(rule)
 
     # Extract stack info
-    stack_section = re.search(r"##\s*Stack\n((?:[-*].*\n)+)", content)
+    stack_section = _STACK_SECTION_RE.search(content)
     if stack_section:
         for line in stack_section.group(1).split("\n"):
             line = line.strip()
@@ -165,26 +269,28 @@ def analyze_claude_md_bak(path: str) -> dict:
                 analysis["stack_info"].append(line.lstrip("-* ").strip())
 
     # Find custom sections (not standard Engram sections)
-    standard_sections = {
-        "identidade", "princípio central", "workflow obrigatório",
-        "antes de codificar", "ao codificar", "depois de codificar",
-        "stack", "auto-geração", "skills disponíveis", "subagentes",
-        "orquestração inteligente", "regras de ouro"
-    }
-    for match in re.finditer(r"^##\s*(.+)$", content, re.MULTILINE):
-        section_name = match.group(1).strip().lower()
-        # Normalize
-        section_name_normalized = re.sub(r"\s*\(.*\)", "", section_name)
-        if section_name_normalized not in standard_sections:
-            # Extract the section content
-            start = match.end()
-            next_section = re.search(r"^##\s", content[start:], re.MULTILINE)
-            end = start + next_section.start() if next_section else len(content)
-            section_content = content[start:end].strip()
+    # Collect all header positions in one scan, then derive each section's
+    # [start, end) from the next header — no re-scan of the tail per match
+    headers = [(m.start(), m.end(), m.group(1).strip()) for m in _H2_RE.finditer(content)]
+    for i, (hs, he, name) in enumerate(headers):
+        # Normalize once; the paren-stripping regex only runs when needed
+        # (_STANDARD_SECTIONS members are already lowercase and paren-free)
+        key = name.lower()
+        if "(" in key:
+            key = _PAREN_RE.sub("", key)
+        if key not in _STANDARD_SECTIONS:
+            # End at the next H2-with-whitespace header; skip the ### lines
+            # _H2_RE also enumerates so subheadings stay inside the section
+            end = next(
+                (nhs for nhs, _, _ in headers[i + 1:] if _H2_BOUNDARY_RE.match(content, nhs)),
+                len(content),
+            )
+            section_content = content[he:end].strip()
             if len(section_content) > 20:  # Only meaningful sections
                 analysis["custom_sections"].append({
-                    "name": match.group(1).strip(),
-                    "content": section_content[:500]  # Limit size
+                    "name": name,
+                    # Limit size — slicing only when it actually truncates
+                    "content": section_content if len(section_content) <= 500 else section_content[:500],
                 })
 
     return analysis
@@ -193,39 +299,24 @@ def analyze_claude_md_bak(path: str) -> dict:
 def analyze_settings_bak(path: str) -> dict:
     """Extract custom permissions from settings.json.bak."""
     try:
-        data = json.loads(Path(path).read_text())
-    except (json.JSONDecodeError, FileNotFoundError):
+        data = _json_loads(Path(path).read_bytes())
+    except (ValueError, FileNotFoundError):
         return {"allow": [], "deny": []}
 
     permissions = data.get("permissions", {})
 
-    # Standard permissions from setup.sh template
-    standard_allow = {
-        "Read", "Write", "Edit", "Glob", "Grep",
-        "Bash(git add:*)", "Bash(git status:*)", "Bash(git commit:*)",
-        "Bash(git log:*)", "Bash(git diff:*)", "Bash(git branch:*)",
-        "Bash(cat:*)", "Bash(ls:*)", "Bash(find:*)", "Bash(grep:*)",
-        "Bash(head:*)", "Bash(tail:*)", "Bash(wc:*)", "Bash(mkdir:*)",
-        "Bash(echo:*)", "Bash(python3:*)", "Bash(npx:*)",
-        "Bash(docker compose:*)"
-    }
-    standard_deny = {
-        "Bash(rm -rf /)*",
-        "Read(.env)", "Read(.env.local)", "Read(.env.production)"
-    }
-
     custom_allow = []
     custom_deny = []
 
     for perm in permissions.get("allow", []):
         # Check if it's a package manager specific or standard
-        if perm not in standard_allow:
+        if perm not in _STANDARD_ALLOW:
             # Ignore package manager variants
-            if not any(pm in perm for pm in ["pnpm", "yarn", "bun", "npm run"]):
+            if not any(pm in perm for pm in _PM_TOKENS):
                 custom_allow.append(perm)
 
     for perm in permissions.get("deny", []):
-        if perm not in standard_deny:
+        if perm not in _STANDARD_DENY:
             custom_deny.append(perm)
 
     return {
@@ -235,30 +326,50 @@ def analyze_settings_bak(path: str) -> dict:
 
 
 def analyze_knowledge_file(path: str, filename: str) -> dict:
-    """Analyze a knowledge file to determine if it has custom content."""
-    content = Path(path).read_text()
+    """
+    Analyze a knowledge file to determine if it has custom content.
 
-    # Template markers indicating auto-generated/empty content
-    template_markers = [
-        "[TODO:", "[A definir]", "[Auto-detectado]", "[Vazio]",
-        "Pendente análise", "rode /init-engram", "será populada pelo"
-    ]
+    The raw content is returned under the private "_content" key so the
+    migration path can merge without re-reading the file; callers that
+    serialize the analysis should drop it first.
+    """
+    # has_custom_content needs meaningful_lines > 5: six lines each strictly
+    # over 20 chars plus five newlines is 6*21 + 5 = 131 bytes minimum (bytes
+    # only exceed chars), so below that one stat call settles it without
+    # open()+read()+splitlines().
+    st_size = os.path.getsize(path)
+    if st_size < 131:
+        return {
+            "path": path,
+            "filename": filename,
+            "is_template": True,
+            "meaningful_lines": 0,
+            "has_custom_content": False,
+            "size_bytes": st_size,
+        }
 
-    # Check if it's mostly template content
-    is_template = any(marker in content for marker in template_markers)
+    content = Path(path).read_text()
 
-    # Count meaningful lines (not headers, not empty, not template)
-    lines = content.split("\n")
+    # Check if it's mostly template content. Template files can never have
+    # has_custom_content, so skip the line scan entirely — the common case
+    # for trees freshly initialized by setup.sh.
+    if _TEMPLATE_MARKERS_RE.search(content):
+        return {
+            "path": path,
+            "filename": filename,
+            "is_template": True,
+            "meaningful_lines": 0,
+            "has_custom_content": False,
+            "size_bytes": len(content),
+            "_content": content,
+        }
+
+    # Count meaningful lines (not headers, not empty) — single pass with the
+    # cheap checks first; no marker test needed, the file has none
     meaningful_lines = 0
-    for line in lines:
+    for line in content.splitlines():
         line = line.strip()
-        if not line:
-            continue
-        if line.startswith("#"):
-            continue
-        if line.startswith(">"):
-            continue
-        if any(marker in line for marker in template_markers):
+        if not line or line[0] in "#>":
             continue
         if len(line) > 20:
             meaningful_lines += 1
@@ -266,10 +377,11 @@ def analyze_knowledge_file(path: str, filename: str) -> dict:
     return {
         "path": path,
         "filename": filename,
-        "is_template": is_template,
+        "is_template": False,
         "meaningful_lines": meaningful_lines,
-        "has_custom_content": meaningful_lines > 5 and not is_template,
+        "has_custom_content": meaningful_lines > 5,
         "size_bytes": len(content),
+        "_content": content,
     }
 
 
@@ -294,17 +406,17 @@ def full_analysis(project_dir: str) -> dict:
         analysis["claude_md_analysis"] = analyze_claude_md_bak(backups["claude_md_bak"])
         if analysis["claude_md_analysis"]["custom_rules"]:
             analysis["migration_recommendations"].append({
-                "type": "rules",
-                "action": "merge",
-                "description": f"Mesclar {len(analysis['claude_md_analysis']['custom_rules'])} regras customizadas no CLAUDE.md",
-                "priority": "high"
+                _K_TYPE: "rules",
+                _K_ACTION: _V_MERGE,
+                _K_DESCRIPTION: f"Mesclar {len(analysis['claude_md_analysis']['custom_rules'])} regras customizadas no CLAUDE.md",
+                _K_PRIORITY: _V_HIGH
             })
         if analysis["claude_md_analysis"]["custom_sections"]:
             analysis["migration_recommendations"].append({
-                "type": "sections",
-                "action": "merge",
-                "description": f"Mesclar {len(analysis['claude_md_analysis']['custom_sections'])} seções customizadas",
-                "priority": "medium"
+                _K_TYPE: "sections",
+                _K_ACTION: _V_MERGE,
+                _K_DESCRIPTION: f"Mesclar {len(analysis['claude_md_analysis']['custom_sections'])} seções customizadas",
+                _K_PRIORITY: _V_MEDIUM
             })
 
     # Analyze settings.json.bak
@@ -313,48 +425,51 @@ def full_analysis(project_dir: str) -> dict:
         custom_perms = len(analysis["settings_analysis"]["allow"]) + len(analysis["settings_analysis"]["deny"])
         if custom_perms > 0:
             analysis["migration_recommendations"].append({
-                "type": "permissions",
-                "action": "merge",
-                "description": f"Mesclar {custom_perms} permissões customizadas no settings.json",
-                "priority": "high"
+                _K_TYPE: "permissions",
+                _K_ACTION: _V_MERGE,
+                _K_DESCRIPTION: f"Mesclar {custom_perms} permissões customizadas no settings.json",
+                _K_PRIORITY: _V_HIGH
             })
 
-    # Analyze knowledge files
+    # Analyze knowledge files — bind the containers once instead of
+    # re-resolving analysis["..."] per file
+    knowledge_analysis = analysis["knowledge_analysis"]
+    recommendations = analysis["migration_recommendations"]
     for key, path in backups["knowledge_bak"].items():
         ka = analyze_knowledge_file(path, key)
-        analysis["knowledge_analysis"][key] = ka
+        knowledge_analysis[key] = ka
         if ka["has_custom_content"]:
-            analysis["migration_recommendations"].append({
-                "type": "knowledge",
-                "file": key,
-                "action": "merge",
-                "description": f"Mesclar conteúdo de {key} ({ka['meaningful_lines']} linhas úteis)",
-                "priority": "high" if "EXPERIENCE" in key or "PATTERN" in key else "medium"
+            recommendations.append({
+                _K_TYPE: "knowledge",
+                _K_FILE: key,
+                _K_ACTION: _V_MERGE,
+                _K_DESCRIPTION: f"Mesclar conteúdo de {key} ({ka['meaningful_lines']} linhas úteis)",
+                _K_PRIORITY: _V_HIGH if _is_high_prio(key) else _V_MEDIUM
             })
 
     # Custom components
     if backups["custom_skills"]:
         analysis["migration_recommendations"].append({
-            "type": "skills",
-            "action": "preserve",
-            "description": f"Preservar {len(backups['custom_skills'])} skills customizados: {', '.join(backups['custom_skills'])}",
-            "priority": "high"
+            _K_TYPE: "skills",
+            _K_ACTION: _V_PRESERVE,
+            _K_DESCRIPTION: f"Preservar {len(backups['custom_skills'])} skills customizados: {', '.join(backups['custom_skills'])}",
+            _K_PRIORITY: _V_HIGH
         })
 
     if backups["custom_commands"]:
         analysis["migration_recommendations"].append({
-            "type": "commands",
-            "action": "preserve",
-            "description": f"Preservar {len(backups['custom_commands'])} commands customizados: {', '.join(backups['custom_commands'])}",
-            "priority": "high"
+            _K_TYPE: "commands",
+            _K_ACTION: _V_PRESERVE,
+            _K_DESCRIPTION: f"Preservar {len(backups['custom_commands'])} commands customizados: {', '.join(backups['custom_commands'])}",
+            _K_PRIORITY: _V_HIGH
         })
 
     if backups["custom_agents"]:
         analysis["migration_recommendations"].append({
-            "type": "agents",
-            "action": "preserve",
-            "description": f"Preservar {len(backups['custom_agents'])} agents customizados: {', '.join(backups['custom_agents'])}",
-            "priority": "high"
+            _K_TYPE: "agents",
+            _K_ACTION: _V_PRESERVE,
+            _K_DESCRIPTION: f"Preservar {len(backups['custom_agents'])} agents customizados: {', '.join(backups['custom_agents'])}",
+            _K_PRIORITY: _V_HIGH
         })
 
     return analysis
@@ -368,29 +483,29 @@ def merge_settings(project_dir: str, settings_analysis: dict) -> bool:
     """Merge custom permissions into current settings.json."""
     settings_path = Path(project_dir) / ".claude" / "settings.json"
 
-    if not settings_path.is_file():
+    if not os.path.isfile(settings_path):
         print("  ⚠️  settings.json não encontrado")
         return False
 
     try:
-        current = json.loads(settings_path.read_text())
-    except json.JSONDecodeError:
+        current = _json_loads(settings_path.read_bytes())
+    except ValueError:
         print("  ⚠️  settings.json inválido")
         return False
 
-    # Merge allow
+    # Merge allow/deny with C-level set difference instead of per-perm lookups;
+    # sorted prints keep the CLI output deterministic
     current_allow = set(current.get("permissions", {}).get("allow", []))
-    for perm in settings_analysis["allow"]:
-        if perm not in current_allow:
-            current_allow.add(perm)
-            print(f"    ✅ Adicionada permissão: {perm}")
+    new_allow = set(settings_analysis["allow"]) - current_allow
+    current_allow |= new_allow
+    for perm in sorted(new_allow):
+        print(f"    ✅ Adicionada permissão: {perm}")
 
-    # Merge deny
     current_deny = set(current.get("permissions", {}).get("deny", []))
-    for perm in settings_analysis["deny"]:
-        if perm not in current_deny:
-            current_deny.add(perm)
-            print(f"    ✅ Adicionada restrição: {perm}")
+    new_deny = set(settings_analysis["deny"]) - current_deny
+    current_deny |= new_deny
+    for perm in sorted(new_deny):
+        print(f"    ✅ Adicionada restrição: {perm}")
 
     # Update and save
     if "permissions" not in current:
@@ -398,158 +513,160 @@ def merge_settings(project_dir: str, settings_analysis: dict) -> bool:
     current["permissions"]["allow"] = sorted(list(current_allow))
     current["permissions"]["deny"] = sorted(list(current_deny))
 
-    settings_path.write_text(json.dumps(current, indent=2, ensure_ascii=False))
+    settings_path.write_bytes(_json_dumps(current))
+    return True
+
+
+def _append_new_entries(dest: Path, new_entries: list, message: str, trailing_newline: bool = True) -> None:
+    """Append deduplicated entries to dest in a single binary write."""
+    if not new_entries:
+        return
+    sep = "\n{}\n" if trailing_newline else "\n{}"
+    payload = "\n\n<!-- Migrado do backup -->\n" + "".join(sep.format(e) for e in new_entries)
+    with open(dest, "ab") as f:
+        f.write(payload.encode("utf-8"))
+    print(f"    ✅ {message.format(len(new_entries))}")
+
+
+def _merge_exp(src_content: str, dest: Path, dest_content: str) -> bool:
+    # Entries are ## headers with content; the id rides along in group 2
+    existing_ids = set(_EXP_ID_RE.findall(dest_content))
+    new_entries = [m.group(1).strip() for m in _EXP_ENTRY_RE.finditer(src_content)
+                   if m.group(2) not in existing_ids]
+    _append_new_entries(dest, new_entries, "Mescladas {} experiências")
+    return True
+
+
+def _merge_pat(src_content: str, dest: Path, dest_content: str) -> bool:
+    existing_ids = set(_PAT_ID_RE.findall(dest_content))
+    new_patterns = [m.group(1).strip() for m in _PAT_ENTRY_RE.finditer(src_content)
+                    if m.group(2) not in existing_ids]
+    _append_new_entries(dest, new_patterns, "Mesclados {} padrões")
+    return True
+
+
+def _merge_adr(src_content: str, dest: Path, dest_content: str) -> bool:
+    existing_ids = set(_ADR_ID_RE.findall(dest_content))
+    new_adrs = [m.group(1).strip() for m in _ADR_ENTRY_RE.finditer(src_content)
+                if m.group(2) not in existing_ids]
+    _append_new_entries(dest, new_adrs, "Mesclados {} ADRs")
+    return True
+
+
+def _merge_domain(src_content: str, dest: Path, dest_content: str) -> bool:
+    # Glossary items (- **Term**: definition)
+    existing_terms = set(_DOMAIN_EXISTING_RE.findall(dest_content))
+    new_terms = [m.group(1).strip() for m in _DOMAIN_TERM_RE.finditer(src_content)
+                 if m.group(2) not in existing_terms]
+    _append_new_entries(dest, new_terms, "Mesclados {} termos do domínio", trailing_newline=False)
+    return True
+
+
+def _merge_priority_noop(src_content: str, dest: Path, dest_content: str) -> bool:
+    # Manual review is needed for priorities (they change over time)
+    print(f"    ⚠️  PRIORITY_MATRIX requer revisão manual (prioridades mudam)")
     return True
 
 
-def merge_knowledge_file(src_path: str, dest_path: str) -> bool:
+def _merge_current_noop(src_content: str, dest: Path, dest_content: str) -> bool:
+    # The new CURRENT_STATE is always more accurate
+    print(f"    ℹ️  CURRENT_STATE usa versão nova (estado atual)")
+    return True
+
+
+# Ordered dispatch: first token found in the source path wins
+_MERGE_HANDLERS = (
+    ("EXPERIENCE", _merge_exp),
+    ("PATTERN", _merge_pat),
+    ("ADR", _merge_adr),
+    ("DOMAIN", _merge_domain),
+    ("PRIORITY", _merge_priority_noop),
+    ("CURRENT_STATE", _merge_current_noop),
+)
+
+
+def merge_knowledge_file(src_path: str, dest_path: str, src_content: Optional[str] = None) -> bool:
     """
     Smart merge of knowledge files.
     Strategy: Append unique entries from backup that aren't in the new file.
+
+    Pass src_content (e.g. from analyze_knowledge_file's "_content") to
+    skip re-reading a source file the analysis already decoded.
     """
     src = Path(src_path)
     dest = Path(dest_path)
 
-    if not src.is_file():
+    if not os.path.isfile(src):
         return False
 
-    if not dest.is_file():
+    if not os.path.lexists(dest):
         # Just copy
         shutil.copy2(src, dest)
         return True
 
-    src_content = src.read_text()
+    if src_content is None:
+        src_content = src.read_text()
     dest_content = dest.read_text()
+    path_str = str(src_path)
 
-    # For EXPERIENCE_LIBRARY: append entries
-    if "EXPERIENCE" in str(src_path):
-        # Find entries (## headers with content)
-        src_entries = re.findall(r"(##\s*EXP-\d+[^\n]*\n(?:(?!##).*\n)*)", src_content)
-        existing_ids = set(re.findall(r"##\s*(EXP-\d+)", dest_content))
-
-        new_entries = []
-        for entry in src_entries:
-            entry_id = re.search(r"##\s*(EXP-\d+)", entry)
-            if entry_id and entry_id.group(1) not in existing_ids:
-                new_entries.append(entry.strip())
-
-        if new_entries:
-            with open(dest, "a") as f:
-                f.write("\n\n<!-- Migrado do backup -->\n")
-                for entry in new_entries:
-                    f.write(f"\n{entry}\n")
-            print(f"    ✅ Mescladas {len(new_entries)} experiências")
-        return True
-
-    # For PATTERNS: append pattern entries
-    if "PATTERN" in str(src_path):
-        src_patterns = re.findall(r"(###\s*PAT-\d+[^\n]*\n(?:(?!###).*\n)*)", src_content)
-        existing_ids = set(re.findall(r"###\s*(PAT-\d+)", dest_content))
-
-        new_patterns = []
-        for pattern in src_patterns:
-            pattern_id = re.search(r"###\s*(PAT-\d+)", pattern)
-            if pattern_id and pattern_id.group(1) not in existing_ids:
-                new_patterns.append(pattern.strip())
-
-        if new_patterns:
-            with open(dest, "a") as f:
-                f.write("\n\n<!-- Migrado do backup -->\n")
-                for pattern in new_patterns:
-                    f.write(f"\n{pattern}\n")
-            print(f"    ✅ Mesclados {len(new_patterns)} padrões")
-        return True
-
-    # For ADR_LOG: append ADR entries
-    if "ADR" in str(src_path):
-        src_adrs = re.findall(r"(##\s*ADR-\d+[^\n]*\n(?:(?!##\s*ADR).*\n)*)", src_content)
-        existing_ids = set(re.findall(r"##\s*(ADR-\d+)", dest_content))
-
-        new_adrs = []
-        for adr in src_adrs:
-            adr_id = re.search(r"##\s*(ADR-\d+)", adr)
-            if adr_id and adr_id.group(1) not in existing_ids:
-                new_adrs.append(adr.strip())
-
-        if new_adrs:
-            with open(dest, "a") as f:
-                f.write("\n\n<!-- Migrado do backup -->\n")
-                for adr in new_adrs:
-                    f.write(f"\n{adr}\n")
-            print(f"    ✅ Mesclados {len(new_adrs)} ADRs")
-        return True
-
-    # For DOMAIN: append glossary entries
-    if "DOMAIN" in str(src_path):
-        # Extract glossary items (- **Term**: definition)
-        src_terms = re.findall(r"(-\s*\*\*[^*]+\*\*:[^\n]+)", src_content)
-        existing_terms = set(re.findall(r"-\s*\*\*([^*]+)\*\*:", dest_content))
-
-        new_terms = []
-        for term in src_terms:
-            term_name = re.search(r"\*\*([^*]+)\*\*", term)
-            if term_name and term_name.group(1) not in existing_terms:
-                new_terms.append(term.strip())
-
-        if new_terms:
-            with open(dest, "a") as f:
-                f.write("\n\n<!-- Migrado do backup -->\n")
-                for term in new_terms:
-                    f.write(f"\n{term}")
-            print(f"    ✅ Mesclados {len(new_terms)} termos do domínio")
-        return True
-
-    # For PRIORITY_MATRIX: append priority items
-    if "PRIORITY" in str(src_path):
-        # Just note that manual review is needed for priorities
-        print(f"    ⚠️  PRIORITY_MATRIX requer revisão manual (prioridades mudam)")
-        return True
-
-    # For CURRENT_STATE: the new one is always more accurate
-    if "CURRENT_STATE" in str(src_path):
-        print(f"    ℹ️  CURRENT_STATE usa versão nova (estado atual)")
-        return True
+    for token, handler in _MERGE_HANDLERS:
+        if token in path_str:
+            return handler(src_content, dest, dest_content)
 
     return False
 
 
 def preserve_custom_components(project_dir: str, backups: dict) -> int:
-    """Copy custom skills, commands, agents from backup."""
-    count = 0
+    """Copy custom skills, commands, agents from backup.
+
+    Copies run in a small thread pool — each is independent I/O, so
+    overlapping them hides per-file syscall/fsync latency.
+    """
     p = Path(project_dir)
     bak = Path(backups["claude_dir_bak"]) if backups["claude_dir_bak"] else None
 
     if not bak:
         return 0
 
-    # Preserve custom skills
+    # (src, dest, is_dir, label) for everything that actually needs copying
+    tasks = []
+
     for skill_name in backups.get("custom_skills", []):
         src = bak / "skills" / skill_name
         dest = p / ".claude" / "skills" / skill_name
-        if src.is_dir() and not dest.exists():
-            shutil.copytree(src, dest)
-            print(f"    ✅ Skill preservado: {skill_name}")
-            count += 1
+        if os.path.isdir(src) and not os.path.lexists(dest):
+            tasks.append((src, dest, True, f"Skill preservado: {skill_name}"))
 
-    # Preserve custom commands
     for cmd_name in backups.get("custom_commands", []):
         src = bak / "commands" / f"{cmd_name}.md"
         dest = p / ".claude" / "commands" / f"{cmd_name}.md"
-        if src.is_file() and not dest.exists():
-            shutil.copy2(src, dest)
-            print(f"    ✅ Command preservado: {cmd_name}")
-            count += 1
+        if os.path.isfile(src) and not os.path.lexists(dest):
+            tasks.append((src, dest, False, f"Command preservado: {cmd_name}"))
 
-    # Preserve custom agents
     for agent_name in backups.get("custom_agents", []):
         src = bak / "agents" / f"{agent_name}.md"
         dest = p / ".claude" / "agents" / f"{agent_name}.md"
-        if src.is_file() and not dest.exists():
+        if os.path.isfile(src) and not os.path.lexists(dest):
+            tasks.append((src, dest, False, f"Agent preservado: {agent_name}"))
+
+    if not tasks:
+        return 0
+
+    print_lock = threading.Lock()
+
+    def _copy(task) -> int:
+        src, dest, is_dir, label = task
+        if is_dir:
+            # dirs_exist_ok skips the redundant pre-existence probe
+            shutil.copytree(src, dest, dirs_exist_ok=True)
+        else:
             shutil.copy2(src, dest)
-            print(f"    ✅ Agent preservado: {agent_name}")
-            count += 1
+        with print_lock:
+            print(f"    ✅ {label}")
+        return 1
 
-    return count
+    with concurrent.futures.ThreadPoolExecutor(max_workers=min(8, len(tasks))) as pool:
+        return sum(pool.map(_copy, tasks))
 
 
 def run_migration(project_dir: str, strategy: str = "smart") -> dict:
@@ -593,7 +710,7 @@ def run_migration(project_dir: str, strategy: str = "smart") -> dict:
                 # Determine dest path
                 subdir, filename = key.split("/")
                 dest = p / ".claude" / "knowledge" / subdir / filename
-                if merge_knowledge_file(ka["path"], str(dest)):
+                if merge_knowledge_file(ka["path"], str(dest), src_content=ka.get("_content")):
                     migrated += 1
 
     return {
@@ -624,25 +741,30 @@ def cleanup_backups(project_dir: str, force: bool = False) -> dict:
 
     # Remove .claude.bak/
     claude_bak = p / ".claude.bak"
-    if claude_bak.is_dir():
+    if os.path.isdir(claude_bak):
         shutil.rmtree(claude_bak)
         removed.append(".claude.bak/")
         print(f"  🗑️  Removido: .claude.bak/")
 
     # Remove CLAUDE.md.bak
     claude_md_bak = p / "CLAUDE.md.bak"
-    if claude_md_bak.is_file():
+    if os.path.isfile(claude_md_bak):
         claude_md_bak.unlink()
         removed.append("CLAUDE.md.bak")
         print(f"  🗑️  Removido: CLAUDE.md.bak")
 
-    # Remove any other .bak files in .claude/
+    # Remove any other .bak files in .claude/ — os.walk + suffix filter is an
+    # order of magnitude faster than rglob's wildcard selector on deep trees
     claude_dir = p / ".claude"
-    if claude_dir.is_dir():
-        for bak_file in claude_dir.rglob("*.bak"):
-            bak_file.unlink()
-            removed.append(str(bak_file.relative_to(p)))
-            print(f"  🗑️  Removido: {bak_file.relative_to(p)}")
+    if os.path.isdir(claude_dir):
+        for root, _dirs, files in os.walk(claude_dir):
+            for name in files:
+                if name.endswith(".bak"):
+                    full = os.path.join(root, name)
+                    os.unlink(full)
+                    rel = os.path.relpath(full, p)
+                    removed.append(rel)
+                    print(f"  🗑️  Removido: {rel}")
 
     return {
         "success": True,
@@ -676,6 +798,8 @@ Examples:
     )
     parser.add_argument("--project-dir", default=".", help="Project root directory")
     parser.add_argument("--detect", action="store_true", help="Detect backups only")
+    parser.add_argument("--quick", action="store_true",
+                       help="With --detect: only check existence, skip enumeration")
     parser.add_argument("--analyze", action="store_true", help="Full analysis with recommendations")
     parser.add_argument("--migrate", action="store_true", help="Run migration")
     parser.add_argument("--strategy", choices=["smart", "preserve", "ignore"], default="smart",
@@ -690,7 +814,7 @@ Examples:
         args.detect = True
 
     if args.detect:
-        result = detect_backups(args.project_dir)
+        result = detect_backups(args.project_dir, quick=args.quick)
         if args.output == "json":
             print(json.dumps(result, indent=2, ensure_ascii=False))
         else:
@@ -715,6 +839,9 @@ Examples:
     elif args.analyze:
         result = full_analysis(args.project_dir)
         if args.output == "json":
+            # Drop cached file contents before serializing
+            for ka in result.get("knowledge_analysis", {}).values():
+                ka.pop("_content", None)
             print(json.dumps(result, indent=2, ensure_ascii=False, default=str))
         else:
             if not result["found"]:
@@ -9,11 +9,64 @@ Usage:
 """
 
 import argparse
+import hashlib
 import json
 import os
 import sys
 from pathlib import Path
 
+CACHE_DIR = Path.home() / ".cache" / "engram"
+
+# Manifests whose content drives detection beyond mere existence — their
+# mtimes go into the fingerprint so edits invalidate the cache.
+FINGERPRINT_MANIFESTS = ("package.json", "composer.json", "Gemfile", "requirements.txt")
+
+# detect_stack also probes the deep tree with these globs; their matches go
+# into the fingerprint so a nested kustomization/argocd file invalidates the
+# cache even when the top-level listing looks unchanged.
+FINGERPRINT_DEEP_GLOBS = ("**/kustomization.yaml", "**/kustomization.yml", "**/argocd-app*.yaml")
+
+
+def stack_fingerprint(project_dir: str) -> str | None:
+    """Cheap fingerprint of the signals detect_stack reads: top-level names +
+    mtimes, plus the paths matched by the recursive infra globs."""
+    try:
+        entries = sorted((e.name, e.stat().st_mtime_ns) for e in os.scandir(project_dir))
+    except OSError:
+        return None
+    for manifest in FINGERPRINT_MANIFESTS:
+        manifest_path = os.path.join(project_dir, manifest)
+        if os.path.isfile(manifest_path):
+            entries.append((manifest, os.stat(manifest_path).st_mtime_ns))
+    p = Path(project_dir)
+    for pattern in FINGERPRINT_DEEP_GLOBS:
+        entries.extend(sorted(str(m.relative_to(p)) for m in p.glob(pattern)))
+    # BLAKE2 over SHA: ~2x faster in pure stdlib, and this is not a security hash.
+    return hashlib.blake2b(str(entries).encode()).digest()[:16].hex()
+
+
+def detect_stack_cached(project_dir: str) -> dict:
+    """detect_stack with a fingerprint-keyed JSON cache — repeat runs on an
+    unchanged tree become a single-file read instead of a filesystem walk."""
+    fp = stack_fingerprint(project_dir)
+    if fp is None:
+        return detect_stack(project_dir)
+
+    cache_path = CACHE_DIR / f"stack-{fp}.json"
+    if cache_path.is_file():
+        try:
+            return json.loads(cache_path.read_text())
+        except (json.JSONDecodeError, OSError):
+            pass
+
+    stack = detect_stack(project_dir)
+    try:
+        CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        cache_path.write_text(json.dumps(stack, ensure_ascii=False))
+    except OSError:
+        pass
+    return stack
+
 
 def detect_stack(project_dir: str) -> dict:
     """Detect project stack from files and configuration."""
@@ -400,9 +453,13 @@ def main():
     parser = argparse.ArgumentParser(description="Engram Project Analyzer")
     parser.add_argument("--project-dir", default=".", help="Project root directory")
     parser.add_argument("--output", choices=["text", "json"], default="text")
+    parser.add_argument("--no-cache", action="store_true", help="Force a fresh filesystem scan")
     args = parser.parse_args()
 
-    stack = detect_stack(args.project_dir)
+    if args.no_cache:
+        stack = detect_stack(args.project_dir)
+    else:
+        stack = detect_stack_cached(args.project_dir)
     suggestions = suggest_components(stack)
 
     if args.output == "json":
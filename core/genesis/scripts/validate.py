@@ -8,9 +8,12 @@ Usage:
     python3 validate.py --type agent --path .claude/agents/my-agent.md
     python3 validate.py --type command --path .claude/commands/my-command.md
     python3 validate.py --type manifest --path .claude/manifest.json
+    python3 validate.py --type skill --path-glob ".claude/skills/*" --jobs 8
 """
 
 import argparse
+import concurrent.futures
+import glob
 import json
 import os
 import re
@@ -240,35 +243,65 @@ def validate_manifest(path: str) -> list[ValidationError]:
     return errors
 
 
+def report(component_type: str, path: str, errors: list[ValidationError]) -> bool:
+    """Print validation results for one component. Returns True if it has hard errors."""
+    has_errors = any(e.level == "error" for e in errors)
+
+    if not errors:
+        print(f"✅ {component_type} '{path}' is valid")
+    else:
+        status = "INVALID" if has_errors else "VALID (with warnings)"
+        icon = "❌" if has_errors else "⚠️"
+        print(f"{icon} {component_type} '{path}': {status}")
+        for e in errors:
+            print(str(e))
+    return has_errors
+
+
 def main():
     parser = argparse.ArgumentParser(description="Engram Component Validator")
     parser.add_argument("--type", required=True, choices=["skill", "agent", "command", "manifest"])
-    parser.add_argument("--path", required=True, help="Path to component")
+    parser.add_argument("--path", help="Path to a single component")
+    parser.add_argument("--path-glob", help='Glob of components to validate (e.g. ".claude/skills/*")')
+    parser.add_argument("--jobs", type=int, default=os.cpu_count(),
+                        help="Parallel workers for --path-glob (default: CPU count)")
     args = parser.parse_args()
 
+    if not args.path and not args.path_glob:
+        parser.error("one of --path or --path-glob is required")
+
     validators = {
         "skill": validate_skill,
         "agent": validate_agent,
         "command": validate_command,
         "manifest": validate_manifest,
     }
+    validator = validators[args.type]
 
-    errors = validators[args.type](args.path)
-
-    has_errors = any(e.level == "error" for e in errors)
-    has_warnings = any(e.level == "warning" for e in errors)
-
-    if not errors:
-        print(f"✅ {args.type} '{args.path}' is valid")
-        sys.exit(0)
-    else:
-        status = "INVALID" if has_errors else "VALID (with warnings)"
-        icon = "❌" if has_errors else "⚠️"
-        print(f"{icon} {args.type} '{args.path}': {status}")
-        for e in errors:
-            print(str(e))
+    if args.path:
+        has_errors = report(args.type, args.path, validator(args.path))
         sys.exit(1 if has_errors else 0)
 
+    paths = sorted(glob.glob(args.path_glob))
+    if not paths:
+        print(f"⚠️ No components match '{args.path_glob}'")
+        sys.exit(1)
+
+    # Validation is IO-bound (scandir/open/regex), so threads give near-linear
+    # speedup across skills and no state is shared between workers.
+    any_errors = False
+    with concurrent.futures.ThreadPoolExecutor(max_workers=args.jobs) as pool:
+        futures = {pool.submit(validator, path): path for path in paths}
+        results = {}
+        for future in concurrent.futures.as_completed(futures):
+            results[futures[future]] = future.result()
+
+    for path in paths:
+        if report(args.type, path, results[path]):
+            any_errors = True
+
+    sys.exit(1 if any_errors else 0)
+
 
 if __name__ == "__main__":
     main()
@@ -4,74 +4,273 @@ Blocks networkx, numpy, sentence_transformers, and chromadb BEFORE any brain imp
 to guarantee all tests use FallbackGraph and MockChromaDB.
 """
 
+import copy
+import heapq
+import math
+import os
+import shutil
 import sys
 import types
 from pathlib import Path
 from datetime import datetime, timedelta
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
 import pytest
 
+# Capture the real numpy BEFORE _block_heavy_deps installs the mock — the mock
+# is what brain code must see, but the mock collection itself may use the real
+# library for its brute-force search (one matmul instead of N Python loops).
+try:
+    import numpy as _real_np
+    # numpy.testing is lazily imported; force it now, while sys.modules still
+    # holds the real package — after the mock is installed the lazy import
+    # would resolve through the stand-in and fail.
+    from numpy.testing import assert_allclose as _real_assert_allclose
+except ImportError:
+    _real_np = None
+    _real_assert_allclose = None
+
+# Opt-in ANN backend for the mock (USE_FAISS_MOCK=1): mirrors production
+# flat-index search semantics and SIMD speed on large seeded collections.
+try:
+    import faiss as _real_faiss
+except ImportError:
+    _real_faiss = None
+
 # ── Block heavy deps so FallbackGraph is always used ──
 _BLOCKED = ("networkx", "nx", "sentence_transformers")
 
 
 class MockChromaCollection:
-    """In-memory mock of a ChromaDB collection using brute-force cosine similarity."""
+    """In-memory mock of a ChromaDB collection using brute-force cosine similarity.
+
+    Storage is struct-of-arrays: parallel id/embedding/metadata lists plus an
+    id->index map. Query walks contiguous rows instead of chasing per-id
+    dicts, and the numpy path stacks the unit-vector rows directly.
+    """
 
     def __init__(self, name="test", metadata=None):
         self.name = name
         self.metadata = metadata or {}
-        self._store = {}  # {id: {"embedding": list, "metadata": dict}}
+        self._ids = []        # row i of each list describes one stored vector
+        self._raw = []        # original embeddings (exact get() round-trip)
+        self._units = []      # L2-normalized embeddings; None if absent/zero
+        self._metadatas = []
+        self._id_to_idx = {}
+        # Lazy numpy cache for query(), rebuilt after any upsert/delete.
+        self._mat = None
+        self._mat_ids = None
+        self._mat_mask = None
+        # Opt-in faiss flat index over the unit vectors (USE_FAISS_MOCK=1)
+        self._use_faiss = (
+            os.environ.get("USE_FAISS_MOCK") == "1"
+            and _real_faiss is not None
+            and _real_np is not None
+        )
+        self._index = None
+        self._index_ids = None
+        # Opt-in int8 scalar quantization (MOCK_CHROMA_INT8=1): stores each
+        # unit vector as int8 codes + one float scale — 4x smaller than
+        # float32, with int32-accumulated dot products at query time.
+        self._use_int8 = (
+            os.environ.get("MOCK_CHROMA_INT8") == "1" and _real_np is not None
+        )
+        self._q8 = []  # parallel to _ids: (int8 codes, scale) or None
 
     def count(self):
-        return len(self._store)
+        return len(self._ids)
+
+    def reset(self):
+        """Drop all stored vectors (used by fixtures that reuse a collection)."""
+        self._ids.clear()
+        self._raw.clear()
+        self._units.clear()
+        self._metadatas.clear()
+        self._id_to_idx.clear()
+        self._q8.clear()
+        self._mat = None
+        self._index = None
 
     def upsert(self, ids, embeddings, metadatas=None):
+        if not ids:
+            return
         for i, nid in enumerate(ids):
-            self._store[nid] = {
-                "embedding": embeddings[i] if embeddings else None,
-                "metadata": metadatas[i] if metadatas else {},
-            }
+            emb = embeddings[i] if embeddings else None
+            # L2-normalize once at write time: cosine then collapses to a dot
+            # product at query time (only the query norm is computed per query).
+            # The raw embedding is kept so get() round-trips exact values.
+            unit = None
+            if emb is not None:
+                n = math.sqrt(sum(x * x for x in emb))
+                if n > 0:
+                    unit = [x / n for x in emb]
+            meta = metadatas[i] if metadatas else {}
+            q8 = self._quantize(unit) if self._use_int8 else None
+            idx = self._id_to_idx.get(nid)
+            if idx is None:
+                self._id_to_idx[nid] = len(self._ids)
+                self._ids.append(nid)
+                self._raw.append(emb)
+                self._units.append(unit)
+                self._metadatas.append(meta)
+                self._q8.append(q8)
+            else:
+                self._raw[idx] = emb
+                self._units[idx] = unit
+                self._metadatas[idx] = meta
+                self._q8[idx] = q8
+        self._mat = None
+        self._index = None
+
+    @staticmethod
+    def _quantize(unit):
+        """Scalar-quantize a unit vector to (int8 codes, float scale)."""
+        if unit is None:
+            return None
+        arr = _real_np.asarray(unit, dtype=_real_np.float32)
+        scale = float(_real_np.max(_real_np.abs(arr))) / 127.0 or 1.0
+        return _real_np.round(arr / scale).astype(_real_np.int8), scale
 
     def get(self, ids, include=None):
+        # Fast-out: empty lookups are a hot path and need no loop setup
+        if not ids:
+            return {"ids": [], "embeddings": []}
         found_ids = []
         found_embeddings = []
         for nid in ids:
-            if nid in self._store:
+            idx = self._id_to_idx.get(nid)
+            if idx is not None:
                 found_ids.append(nid)
-                found_embeddings.append(self._store[nid]["embedding"])
+                found_embeddings.append(self._raw[idx])
         return {"ids": found_ids, "embeddings": found_embeddings}
 
     def query(self, query_embeddings, n_results=10):
-        """Brute-force cosine distance search (mirrors ChromaDB behavior)."""
-        if not self._store:
+        """Brute-force cosine distance search (mirrors ChromaDB behavior).
+
+        With real numpy available, all cosine similarities come from a single
+        matrix-vector product over a lazily built embedding matrix; otherwise
+        falls back to the pure-Python per-vector loop.
+        """
+        if not self._ids:
             return {"ids": [[]], "distances": [[]]}
         qe = query_embeddings[0]
+
+        norm_q = math.sqrt(sum(x * x for x in qe))
+
+        if self._use_int8 and norm_q > 0:
+            # int8 dot products with an int32 accumulator, rescaled back to
+            # the float cosine — bandwidth-friendly, small quantization error.
+            q_codes, q_scale = self._quantize([x / norm_q for x in qe])
+            q_i32 = q_codes.astype(_real_np.int32)
+            scored = []
+            for i, nid in enumerate(self._ids):
+                if self._raw[i] is None:
+                    continue
+                entry = self._q8[i]
+                if entry is None:
+                    scored.append((2.0, nid))
+                    continue
+                codes, scale = entry
+                dot = int(_real_np.dot(q_i32, codes.astype(_real_np.int32)))
+                scored.append((1.0 - dot * scale * q_scale, nid))
+            top = heapq.nsmallest(n_results, scored)
+            return {
+                "ids": [[nid for _, nid in top]],
+                "distances": [[dist for dist, _ in top]],
+            }
+
+        if self._use_faiss and norm_q > 0:
+            # Flat inner-product index over the unit vectors — same exact
+            # results as brute force, SIMD kernels doing the scan. Zero-norm
+            # embeddings are not indexable and are left out of faiss results.
+            if self._index is None:
+                rows = [i for i, u in enumerate(self._units) if u is not None]
+                self._index_ids = [self._ids[i] for i in rows]
+                self._index = _real_faiss.IndexFlatIP(len(qe))
+                if rows:
+                    self._index.add(_real_np.asarray(
+                        [self._units[i] for i in rows], dtype=_real_np.float32))
+            if not self._index_ids:
+                return {"ids": [[]], "distances": [[]]}
+            q = _real_np.asarray([[x / norm_q for x in qe]], dtype=_real_np.float32)
+            k = min(n_results, len(self._index_ids))
+            sims, idx = self._index.search(q, k)
+            return {
+                "ids": [[self._index_ids[i] for i in idx[0]]],
+                "distances": [[float(1.0 - s) for s in sims[0]]],
+            }
+
+        if _real_np is not None:
+            if self._mat is None:
+                rows = [i for i, raw in enumerate(self._raw) if raw is not None]
+                self._mat_ids = [self._ids[i] for i in rows]
+                dim = len(qe)
+                # Rows are unit vectors; zero-norm embeddings become zero rows
+                # and are masked out below (distance 2.0, like the loop path).
+                self._mat = _real_np.asarray(
+                    [self._units[i] or [0.0] * dim for i in rows],
+                    dtype=_real_np.float32,
+                )
+                self._mat_mask = _real_np.asarray(
+                    [self._units[i] is not None for i in rows]
+                )
+            if not self._mat_ids:
+                return {"ids": [[]], "distances": [[]]}
+            q = _real_np.asarray(qe, dtype=_real_np.float32)
+            if norm_q > 0:
+                sims = _real_np.where(self._mat_mask, (self._mat @ q) / norm_q, -1.0)
+            else:
+                sims = _real_np.full(len(self._mat_ids), -1.0)
+            k = min(n_results, len(self._mat_ids))
+            idx = _real_np.argpartition(-sims, k - 1)[:k]
+            idx = idx[_real_np.argsort(-sims[idx])]
+            return {
+                "ids": [[self._mat_ids[i] for i in idx]],
+                "distances": [[float(1.0 - sims[i]) for i in idx]],
+            }
+
         scored = []
-        for nid, data in self._store.items():
-            emb = data["embedding"]
-            if emb is None:
+        for i, nid in enumerate(self._ids):
+            if self._raw[i] is None:
                 continue
-            dot = sum(a * b for a, b in zip(qe, emb))
-            norm_q = sum(x * x for x in qe) ** 0.5
-            norm_e = sum(x * x for x in emb) ** 0.5
-            if norm_q > 0 and norm_e > 0:
-                cos_sim = dot / (norm_q * norm_e)
-                distance = 1.0 - cos_sim
+            unit = self._units[i]
+            if norm_q > 0 and unit is not None:
+                dot = sum(a * b for a, b in zip(qe, unit))
+                distance = 1.0 - dot / norm_q
             else:
                 distance = 2.0
-            scored.append((nid, distance))
-        scored.sort(key=lambda x: x[1])
-        top = scored[:n_results]
+            scored.append((distance, nid))
+        # Bounded heap: O(N log k) for top-k instead of a full O(N log N)
+        # sort; (distance, nid) tuples compare at C level, no key callback.
+        top = heapq.nsmallest(n_results, scored)
         return {
-            "ids": [[nid for nid, _ in top]],
-            "distances": [[dist for _, dist in top]],
+            "ids": [[nid for _, nid in top]],
+            "distances": [[dist for dist, _ in top]],
         }
 
     def delete(self, ids):
+        if not ids:
+            return
         for nid in ids:
-            self._store.pop(nid, None)
+            idx = self._id_to_idx.pop(nid, None)
+            if idx is None:
+                continue
+            # Swap-with-last keeps the parallel arrays contiguous in O(1)
+            last = len(self._ids) - 1
+            if idx != last:
+                self._ids[idx] = self._ids[last]
+                self._raw[idx] = self._raw[last]
+                self._units[idx] = self._units[last]
+                self._metadatas[idx] = self._metadatas[last]
+                self._q8[idx] = self._q8[last]
+                self._id_to_idx[self._ids[idx]] = idx
+            self._ids.pop()
+            self._raw.pop()
+            self._units.pop()
+            self._metadatas.pop()
+            self._q8.pop()
+        self._mat = None
+        self._index = None
 
 
 class MockChromaClient:
@@ -87,31 +286,54 @@ class MockChromaClient:
         return self._collections[name]
 
 
-@pytest.fixture(autouse=True, scope="session")
-def _block_heavy_deps():
-    """Block networkx/numpy/sentence_transformers/chromadb for the entire test session.
+# Idempotence guard for the mock install. Each pytest-xdist worker is its
+# own process with its own sys.modules and its own copy of this flag, so the
+# mocks install independently per worker and never race across workers.
+_mocks_installed = False
+_saved_modules = {}
 
-    numpy is replaced with a MagicMock that exposes the attrs brain.py/embeddings.py
-    need at import time (ndarray, array, dot, linalg.norm) so the modules can be
-    imported without sys.exit().
 
-    chromadb is replaced with a mock module exposing PersistentClient.
+def _install_heavy_dep_mocks():
+    """Block networkx/numpy/sentence_transformers/chromadb in sys.modules.
+
+    Runs at conftest import time (before test modules are collected) so test
+    files can import recall/sleep/brain at module scope; the session fixture
+    below restores the originals at the end of the run.
     """
-    saved = {}
+    global _mocks_installed
+    if _mocks_installed:
+        return
+
+    saved = _saved_modules
 
     # Block networkx and sentence_transformers
     for mod_name in _BLOCKED:
         saved[mod_name] = sys.modules.get(mod_name)
         sys.modules[mod_name] = None  # type: ignore[assignment]
 
-    # Block numpy with a mock that prevents sys.exit in embeddings.py
-    np_mock = MagicMock()
-    np_mock.__name__ = "numpy"
-    np_mock.ndarray = list
-    np_mock.array = lambda x: list(x) if hasattr(x, '__iter__') else [x]
-    np_mock.dot = lambda a, b: sum(x * y for x, y in zip(a, b))
-    linalg_mock = MagicMock()
-    linalg_mock.norm = lambda v, **kw: sum(x * x for x in v) ** 0.5
+    # Block numpy with a stand-in module that prevents sys.exit in
+    # embeddings.py. A real ModuleType (not MagicMock) keeps attribute access
+    # at plain dict-lookup cost — MagicMock synthesizes and records a child
+    # mock per access. Only the six attrs brain code touches are provided.
+    # When the real numpy is installed, they're backed by its C
+    # implementations; otherwise by pure-Python fallbacks.
+    np_mock = types.ModuleType("numpy")
+    linalg_mock = types.ModuleType("numpy.linalg")
+    if _real_np is not None:
+        np_mock.ndarray = _real_np.ndarray
+        np_mock.array = _real_np.asarray
+        np_mock.dot = _real_np.dot
+        np_mock.savez_compressed = _real_np.savez_compressed
+        np_mock.load = _real_np.load
+        linalg_mock.norm = _real_np.linalg.norm
+    else:
+        np_mock.ndarray = list
+        np_mock.array = lambda x: list(x) if hasattr(x, '__iter__') else [x]
+        np_mock.dot = lambda a, b: sum(x * y for x, y in zip(a, b))
+        # No-ops, but present so patch.object has an attribute to replace
+        np_mock.savez_compressed = lambda *args, **kwargs: None
+        np_mock.load = lambda *args, **kwargs: None
+        linalg_mock.norm = lambda v, **kw: sum(x * x for x in v) ** 0.5
     np_mock.linalg = linalg_mock
     saved["numpy"] = sys.modules.get("numpy")
     saved["np"] = sys.modules.get("np")
@@ -123,33 +345,178 @@ def _block_heavy_deps():
     saved["chromadb"] = sys.modules.get("chromadb")
     sys.modules["chromadb"] = chromadb_mock
 
+    _mocks_installed = True
+
+
+@pytest.fixture(autouse=True, scope="session")
+def _block_heavy_deps():
+    """Keep the heavy-dep mocks installed for the session and restore after.
+
+    numpy is replaced with a stand-in module exposing the attrs
+    brain.py/embeddings.py need at import time (ndarray, array, dot,
+    linalg.norm) so the modules can be imported without sys.exit();
+    chromadb is replaced with a mock module exposing PersistentClient.
+    The actual install happens at conftest import time (see
+    _install_heavy_dep_mocks) so module-scope imports in test files work.
+
+    xdist-safe: the suite can run under `pytest -n auto` — workers are separate
+    processes, mock state is per-process, and nothing here touches shared files.
+    """
+    global _mocks_installed
+    _install_heavy_dep_mocks()
     yield
 
     # Restore
-    for mod_name, original in saved.items():
+    for mod_name, original in _saved_modules.items():
         if original is None:
             sys.modules.pop(mod_name, None)
         else:
             sys.modules[mod_name] = original
+    _saved_modules.clear()
+    _mocks_installed = False
 
 
 # ── Path setup ──
 BRAIN_DIR = Path(__file__).resolve().parent.parent.parent / ".claude" / "brain"
 FIXTURES_DIR = Path(__file__).resolve().parent / "fixtures"
 
+# Installed/inserted at import time so collection-time imports of brain
+# modules (recall, sleep, brain_sqlite) in test files resolve correctly.
+_install_heavy_dep_mocks()
+if str(BRAIN_DIR) not in sys.path:
+    sys.path.insert(0, str(BRAIN_DIR))
+
 
 @pytest.fixture(autouse=True, scope="session")
 def _add_brain_to_path():
-    """Add .claude/brain/ to sys.path so we can import brain, sleep, etc."""
+    """Ensure .claude/brain/ is on sys.path (inserted at conftest import)."""
     brain_str = str(BRAIN_DIR)
     if brain_str not in sys.path:
         sys.path.insert(0, brain_str)
     yield
 
 
+# ── Recall mocking helpers ──
+
+
+@pytest.fixture
+def recall_deps_mock():
+    """Force recall onto the mocked-deps text-search path for one test.
+
+    One patch.multiple entry replaces the HAS_DEPS/HAS_EMBEDDINGS pair each
+    TestSearchBrain test used to stack; tests still patch recall.Brain
+    locally with their per-test mock.
+    """
+    with patch.multiple("recall", HAS_DEPS=True, HAS_EMBEDDINGS=False):
+        yield
+
+
+@pytest.fixture
+def mocked_brain(seeded_brain):
+    """(brain, brain_cls) pair ready to stand in for recall.Brain.
+
+    load/save are stubbed on the seeded clone and a single class mock
+    returning it is built here, instead of three MagicMock constructions
+    per test.
+    """
+    seeded_brain.load = MagicMock(return_value=True)
+    seeded_brain.save = MagicMock()
+    return seeded_brain, MagicMock(return_value=seeded_brain)
+
+
+# ── Assertion helpers ──
+
+
+@pytest.fixture(scope="session")
+def assert_vec_equal():
+    """Tolerant element-wise vector comparison.
+
+    Embedding round-trips may pass through float32/ndarray representations;
+    comparing with a tolerance keeps the assertions valid across numeric
+    backends instead of requiring exact list equality.
+    """
+    if _real_np is not None:
+        def _cmp(got, want, tol=1e-6):
+            _real_assert_allclose(
+                _real_np.asarray(list(got), dtype=float),
+                _real_np.asarray(want, dtype=float),
+                atol=tol,
+            )
+        return _cmp
+
+    def _cmp(got, want, tol=1e-6):
+        got = list(got)
+        assert len(got) == len(want), (got, want)
+        for g, w in zip(got, want):
+            assert abs(float(g) - float(w)) <= tol, (got, want)
+    return _cmp
+
+
 # ── Brain fixtures ──
 
 
+@pytest.fixture(scope="session")
+def BrainSQLiteCls(_block_heavy_deps, _add_brain_to_path):
+    """The BrainSQLite class, imported once per session.
+
+    Importing here (after the heavy-dep mocks are installed) replaces the
+    per-test `from brain_sqlite import BrainSQLite` boilerplate.
+    """
+    from brain_sqlite import BrainSQLite
+    return BrainSQLite
+
+
+@pytest.fixture(scope="session")
+def _brain_template(tmp_path_factory, BrainSQLiteCls):
+    """A pristine brain.db, bootstrapped once per session.
+
+    Copying this file is one syscall versus re-running the CREATE TABLE /
+    pragma sequence for every test that wants an empty on-disk brain.
+    """
+    d = tmp_path_factory.mktemp("brain_template")
+    b = BrainSQLiteCls(base_path=d)
+    b.load()
+    b.close()
+    return d / "brain.db"
+
+
+@pytest.fixture
+def fresh_brain_path(tmp_path, _brain_template):
+    """Per-test base_path pre-seeded with a copy of the template brain.db."""
+    shutil.copy(_brain_template, tmp_path / "brain.db")
+    return tmp_path
+
+
+@pytest.fixture(scope="class")
+def _class_chroma_brain(tmp_path_factory):
+    """One initialized BrainSQLite per test class.
+
+    The sqlite schema bootstrap and Chroma-mock setup run once per class
+    instead of once per test; chroma_brain wipes state between tests.
+    """
+    from brain_sqlite import BrainSQLite
+    brain = BrainSQLite(base_path=tmp_path_factory.mktemp("chroma_brain"))
+    brain.load()
+    brain._ensure_vector_store()
+    yield brain
+    brain.close()
+
+
+@pytest.fixture
+def chroma_brain(_class_chroma_brain):
+    """Class-cached BrainSQLite, reset to a pristine state for each test."""
+    brain = _class_chroma_brain
+    conn = brain._get_conn()
+    conn.execute("DELETE FROM edges")
+    conn.execute("DELETE FROM nodes")
+    conn.commit()
+    coll = brain._chroma_collection
+    if coll is not None:
+        coll.reset()
+    brain._npz_embeddings = {}
+    return brain
+
+
 @pytest.fixture
 def empty_brain(tmp_path):
     """A fresh Brain with no nodes, base_path pointing to tmp_path."""
@@ -158,9 +525,9 @@ def empty_brain(tmp_path):
     return b
 
 
-@pytest.fixture
-def seeded_brain(tmp_path):
-    """Brain pre-populated with 7 nodes and various edges.
+@pytest.fixture(scope="session")
+def _seeded_brain_template(tmp_path_factory):
+    """Session-built Brain with 7 nodes and various edges (see seeded_brain).
 
     Nodes:
       - adr1: ADR/Decision  (title: "ADR-001: Use FallbackGraph")
@@ -182,10 +549,14 @@ def seeded_brain(tmp_path):
     """
     from brain import Brain
 
-    b = Brain(base_path=tmp_path / "brain")
+    b = Brain(base_path=tmp_path_factory.mktemp("seeded_brain") / "brain")
     now = datetime.now().isoformat()
     recent = (datetime.now() - timedelta(days=1)).isoformat()
 
+    # Shared timestamps/decay are identical for all 7 nodes — build the
+    # template once and shallow-copy per node instead of re-literalizing it.
+    base_memory = {"last_accessed": now, "created_at": recent, "decay_rate": 0.01}
+
     # Helper to add node directly (bypass add_memory to have deterministic IDs)
     def _add(node_id, labels, title, content="", extra_props=None, strength=1.0, access_count=1):
         props = {"title": title, "content": content, "summary": content[:200], "author": "test@dev.com"}
@@ -195,13 +566,7 @@ def seeded_brain(tmp_path):
             node_id,
             labels=labels,
             props=props,
-            memory={
-                "strength": strength,
-                "access_count": access_count,
-                "last_accessed": now,
-                "created_at": recent,
-                "decay_rate": 0.01,
-            },
+            memory={**base_memory, "strength": strength, "access_count": access_count},
         )
 
     _add("adr1", ["Decision", "ADR"], "ADR-001: Use FallbackGraph",
@@ -238,28 +603,40 @@ def seeded_brain(tmp_path):
     return b
 
 
+@pytest.fixture
+def seeded_brain(_seeded_brain_template):
+    """Per-test deep copy of the session-built seeded Brain.
+
+    The graph is constructed once per session; tests get an isolated clone
+    they are free to mutate. Node/edge layout is documented on the template.
+    """
+    return copy.deepcopy(_seeded_brain_template)
+
+
 # ── Fixture file readers ──
+# Session scope: the fixture .md files are immutable inputs, so one read +
+# UTF-8 decode per session instead of one per consuming test.
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_adr_log():
     """Content of sample_adr_log.md fixture."""
     return (FIXTURES_DIR / "sample_adr_log.md").read_text(encoding="utf-8")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_domain():
     """Content of sample_domain.md fixture."""
     return (FIXTURES_DIR / "sample_domain.md").read_text(encoding="utf-8")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_patterns():
     """Content of sample_patterns.md fixture."""
     return (FIXTURES_DIR / "sample_patterns.md").read_text(encoding="utf-8")
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def sample_experiences():
     """Content of sample_experiences.md fixture."""
     return (FIXTURES_DIR / "sample_experiences.md").read_text(encoding="utf-8")
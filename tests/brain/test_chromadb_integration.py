@@ -13,10 +13,9 @@ import pytest
 class TestVectorStoreInit:
     """_ensure_vector_store() initialization and fallback."""
 
-    def test_chromadb_initializes(self, tmp_path):
+    def test_chromadb_initializes(self, fresh_brain_path, BrainSQLiteCls):
         """When chromadb module is available, brain uses ChromaDB."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain._ensure_vector_store()
 
@@ -24,15 +23,14 @@ class TestVectorStoreInit:
         assert brain._chroma_collection is not None
         assert brain._chroma_client is not None
 
-    def test_fallback_to_npz_when_chromadb_fails(self, tmp_path):
+    def test_fallback_to_npz_when_chromadb_fails(self, fresh_brain_path, BrainSQLiteCls):
         """When ChromaDB init fails, falls back to npz."""
         import chromadb
         original = chromadb.PersistentClient
 
         chromadb.PersistentClient = MagicMock(side_effect=Exception("fail"))
         try:
-            from brain_sqlite import BrainSQLite
-            brain = BrainSQLite(base_path=tmp_path)
+            brain = BrainSQLiteCls(base_path=fresh_brain_path)
             brain.load()
             brain._ensure_vector_store()
 
@@ -41,10 +39,9 @@ class TestVectorStoreInit:
         finally:
             chromadb.PersistentClient = original
 
-    def test_idempotent_init(self, tmp_path):
+    def test_idempotent_init(self, fresh_brain_path, BrainSQLiteCls):
         """Calling _ensure_vector_store() multiple times is a no-op."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain._ensure_vector_store()
         coll1 = brain._chroma_collection
@@ -56,81 +53,82 @@ class TestVectorStoreInit:
 class TestStoreAndRetrieve:
     """_store_embedding(), get_embedding_vectors(), _remove_embedding()."""
 
-    def test_store_and_retrieve(self, tmp_path):
+    def test_store_and_retrieve(self, chroma_brain, assert_vec_equal):
         """Store an embedding and retrieve it."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-
+        brain = chroma_brain
         brain._store_embedding("node1", [0.1, 0.2, 0.3])
         vectors = brain.get_embedding_vectors(["node1"])
         assert "node1" in vectors
-        assert list(vectors["node1"]) == [0.1, 0.2, 0.3]
+        assert_vec_equal(vectors["node1"], [0.1, 0.2, 0.3])
 
-    def test_store_multiple(self, tmp_path):
+    def test_store_multiple(self, chroma_brain):
         """Store multiple embeddings."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
+        base_count = brain._embedding_count()
 
-        brain._store_embedding("a", [1.0, 0.0, 0.0])
-        brain._store_embedding("b", [0.0, 1.0, 0.0])
-        brain._store_embedding("c", [0.0, 0.0, 1.0])
+        brain._store_embeddings_batch(
+            ["a", "b", "c"],
+            [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0], [0.0, 0.0, 1.0]],
+        )
 
-        assert brain._embedding_count() == 3
+        assert brain._embedding_count() == base_count + 3
         vecs = brain.get_embedding_vectors(["a", "b", "c"])
         assert len(vecs) == 3
 
-    def test_upsert_overwrites(self, tmp_path):
+    def test_upsert_overwrites(self, chroma_brain, assert_vec_equal):
         """Upsert should overwrite existing embedding."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
+        base_count = brain._embedding_count()
 
         brain._store_embedding("n1", [1.0, 0.0, 0.0])
         brain._store_embedding("n1", [0.0, 1.0, 0.0])
 
-        assert brain._embedding_count() == 1
+        assert brain._embedding_count() == base_count + 1
         vecs = brain.get_embedding_vectors(["n1"])
-        assert list(vecs["n1"]) == [0.0, 1.0, 0.0]
+        assert_vec_equal(vecs["n1"], [0.0, 1.0, 0.0])
+
+    def test_batch_matches_serial(self, chroma_brain):
+        """_store_embeddings_batch end-state matches serial _store_embedding calls."""
+        brain = chroma_brain
+
+        brain._store_embedding("s1", [1.0, 0.0, 0.0])
+        brain._store_embedding("s2", [0.0, 1.0, 0.0])
+        serial = brain.get_embedding_vectors(["s1", "s2"])
 
-    def test_remove_embedding(self, tmp_path):
+        brain._store_embeddings_batch(["b1", "b2"], [[1.0, 0.0, 0.0], [0.0, 1.0, 0.0]])
+        batched = brain.get_embedding_vectors(["b1", "b2"])
+
+        assert list(batched["b1"]) == list(serial["s1"])
+        assert list(batched["b2"]) == list(serial["s2"])
+        assert brain._embedding_count() == 4
+
+    def test_remove_embedding(self, chroma_brain):
         """_remove_embedding() should delete from store."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
+        base_count = brain._embedding_count()
 
         brain._store_embedding("n1", [0.1, 0.2, 0.3])
-        assert brain._embedding_count() == 1
+        assert brain._embedding_count() == base_count + 1
 
         brain._remove_embedding("n1")
-        assert brain._embedding_count() == 0
+        assert brain._embedding_count() == base_count
 
-    def test_remove_nonexistent_is_safe(self, tmp_path):
+    def test_remove_nonexistent_is_safe(self, chroma_brain):
         """Removing a nonexistent embedding should not raise."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-        brain._ensure_vector_store()
+        brain = chroma_brain
 
         brain._remove_embedding("does_not_exist")  # should not raise
 
-    def test_get_nonexistent_returns_empty(self, tmp_path):
+    def test_get_nonexistent_returns_empty(self, chroma_brain):
         """Getting embeddings for missing IDs returns empty dict."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-        brain._ensure_vector_store()
+        brain = chroma_brain
 
         vecs = brain.get_embedding_vectors(["missing1", "missing2"])
         assert vecs == {}
 
-    def test_get_empty_list(self, tmp_path):
+    def test_get_empty_list(self, chroma_brain):
         """Getting embeddings for empty list returns empty dict."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-        brain._ensure_vector_store()
+        brain = chroma_brain
 
         vecs = brain.get_embedding_vectors([])
         assert vecs == {}
@@ -139,11 +137,9 @@ class TestStoreAndRetrieve:
 class TestSearchByEmbedding:
     """search_by_embedding() with ChromaDB backend."""
 
-    def test_search_returns_sorted_results(self, tmp_path):
+    def test_search_returns_sorted_results(self, chroma_brain):
         """Search should return results sorted by similarity."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
 
         # Store embeddings: n1 is closest to query, n3 is furthest
         brain._store_embedding("n1", [1.0, 0.0, 0.0])
@@ -156,24 +152,20 @@ class TestSearchByEmbedding:
         assert results[0][0] == "n1"
         assert results[0][1] > results[1][1]
 
-    def test_search_empty_store(self, tmp_path):
+    def test_search_empty_store(self, chroma_brain):
         """Search on empty store returns empty list."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-        brain._ensure_vector_store()
+        brain = chroma_brain
 
         results = brain.search_by_embedding([1.0, 0.0, 0.0], top_k=5)
         assert results == []
 
-    def test_search_top_k_limit(self, tmp_path):
+    def test_search_top_k_limit(self, chroma_brain):
         """top_k should limit results."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
 
-        for i in range(10):
-            brain._store_embedding(f"n{i}", [float(i % 3), float(i % 2), 0.1])
+        ids = [f"n{i}" for i in range(10)]
+        vectors = [[float(i % 3), float(i % 2), 0.1] for i in range(10)]
+        brain._store_embeddings_batch(ids, vectors)
 
         results = brain.search_by_embedding([1.0, 0.0, 0.0], top_k=3)
         assert len(results) <= 3
@@ -182,11 +174,10 @@ class TestSearchByEmbedding:
 class TestAddMemoryWithEmbedding:
     """add_memory() and _upsert_node() embedding integration."""
 
-    def test_add_memory_stores_embedding(self, tmp_path):
+    def test_add_memory_stores_embedding(self, chroma_brain):
         """add_memory with embedding param should store in ChromaDB."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
+        base_count = brain._embedding_count()
 
         node_id = brain.add_memory(
             title="Test Memory",
@@ -196,15 +187,14 @@ class TestAddMemoryWithEmbedding:
             embedding=[0.1, 0.2, 0.3]
         )
 
-        assert brain._embedding_count() >= 1
+        assert brain._embedding_count() == base_count + 1
         vecs = brain.get_embedding_vectors([node_id])
         assert node_id in vecs
 
-    def test_remove_node_removes_embedding(self, tmp_path):
+    def test_remove_node_removes_embedding(self, chroma_brain):
         """remove_node() should also remove from ChromaDB."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
+        base_count = brain._embedding_count()
 
         node_id = brain.add_memory(
             title="To Be Removed",
@@ -214,7 +204,7 @@ class TestAddMemoryWithEmbedding:
             embedding=[0.1, 0.2, 0.3]
         )
 
-        assert brain._embedding_count() >= 1
+        assert brain._embedding_count() == base_count + 1
         brain.remove_node(node_id)
 
         vecs = brain.get_embedding_vectors([node_id])
@@ -224,25 +214,19 @@ class TestAddMemoryWithEmbedding:
 class TestGetStats:
     """get_stats() with ChromaDB backend."""
 
-    def test_stats_include_vector_backend(self, tmp_path):
+    def test_stats_include_vector_backend(self, chroma_brain):
         """Stats should report which vector backend is active."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
-        brain._ensure_vector_store()
+        brain = chroma_brain
 
         stats = brain.get_stats()
         assert "vector_backend" in stats
         assert stats["vector_backend"] == "chromadb"
 
-    def test_stats_embedding_count(self, tmp_path):
+    def test_stats_embedding_count(self, chroma_brain):
         """Stats embedding count should reflect ChromaDB store."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
 
-        brain._store_embedding("x1", [0.1, 0.2, 0.3])
-        brain._store_embedding("x2", [0.4, 0.5, 0.6])
+        brain._store_embeddings_batch(["x1", "x2"], [[0.1, 0.2, 0.3], [0.4, 0.5, 0.6]])
 
         stats = brain.get_stats()
         assert stats["embeddings"] == 2
@@ -251,19 +235,15 @@ class TestGetStats:
 class TestBackwardCompat:
     """Backward compatibility: brain.embeddings property."""
 
-    def test_embeddings_property_returns_dict(self, tmp_path):
+    def test_embeddings_property_returns_dict(self, chroma_brain):
         """brain.embeddings should still be a dict (npz fallback)."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
 
         assert isinstance(brain.embeddings, dict)
 
-    def test_embeddings_setter(self, tmp_path):
+    def test_embeddings_setter(self, chroma_brain):
         """brain.embeddings = {...} should still work."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
-        brain.load()
+        brain = chroma_brain
 
         brain.embeddings = {"n1": [0.1, 0.2]}
         assert brain.embeddings == {"n1": [0.1, 0.2]}
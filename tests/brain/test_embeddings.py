@@ -10,10 +10,9 @@ import pytest
 class TestBuildEmbeddings:
     """embeddings.build_embeddings() — uses ChromaDB mock from conftest."""
 
-    def test_build_stores_in_chromadb(self, tmp_path):
+    def test_build_stores_in_chromadb(self, fresh_brain_path, BrainSQLiteCls):
         """build_embeddings() should upsert into ChromaDB when available."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain.add_node_raw(
             "n1",
@@ -31,18 +30,17 @@ class TestBuildEmbeddings:
         with patch("embeddings.get_embedding", return_value=fake_vector), \
              patch("embeddings._get_brain", return_value=brain):
             from embeddings import build_embeddings
-            build_embeddings(brain_path=tmp_path)
+            build_embeddings(brain_path=fresh_brain_path)
 
         # Verify ChromaDB has the embedding (same brain instance)
         assert brain._chroma_collection.count() >= 1
 
-    def test_build_fallback_npz(self, tmp_path):
+    def test_build_fallback_npz(self, fresh_brain_path, BrainSQLiteCls):
         """If ChromaDB init fails, build_embeddings() falls back to npz."""
         import sys
         np_mock = sys.modules["numpy"]
 
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain.add_node_raw(
             "n1",
@@ -63,7 +61,7 @@ class TestBuildEmbeddings:
                  patch("embeddings._get_brain", return_value=brain):
                 with patch.object(np_mock, "savez_compressed") as mock_save:
                     from embeddings import build_embeddings
-                    build_embeddings(brain_path=tmp_path)
+                    build_embeddings(brain_path=fresh_brain_path)
                     mock_save.assert_called_once()
         finally:
             chromadb.PersistentClient = original_client
@@ -72,10 +70,9 @@ class TestBuildEmbeddings:
 class TestSearchEmbeddings:
     """embeddings.search_embeddings() — uses ChromaDB mock from conftest."""
 
-    def test_search_returns_results_chromadb(self, tmp_path):
+    def test_search_returns_results_chromadb(self, fresh_brain_path, BrainSQLiteCls):
         """search_embeddings() should use ChromaDB when available."""
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain.add_node_raw(
             "n1",
@@ -91,7 +88,7 @@ class TestSearchEmbeddings:
         with patch("embeddings.get_embedding", return_value=[0.1, 0.2, 0.3]), \
              patch("embeddings._get_brain", return_value=brain):
             from embeddings import search_embeddings
-            results = search_embeddings("auth", brain_path=tmp_path, top_k=5)
+            results = search_embeddings("auth", brain_path=fresh_brain_path, top_k=5)
             assert len(results) >= 1
             assert results[0]["id"] == "n1"
 
@@ -99,27 +96,32 @@ class TestSearchEmbeddings:
 class TestMigrateEmbeddings:
     """embeddings.migrate_embeddings() — npz -> ChromaDB migration."""
 
-    def test_migrate_from_npz(self, tmp_path):
+    def test_migrate_from_npz(self, fresh_brain_path, BrainSQLiteCls):
         """migrate_embeddings() should read npz and upsert into ChromaDB."""
         import sys
         np_mock = sys.modules["numpy"]
 
-        # Create a fake npz file
-        fake_npz = MagicMock()
-        fake_npz.files = ["n1", "n2"]
-        fake_npz.__getitem__ = lambda self, k: [0.1, 0.2, 0.3]
-        (tmp_path / "embeddings.npz").write_text("fake")
+        # Fake npz handle as a plain class — real attribute dispatch instead
+        # of MagicMock's per-access child-mock synthesis, which matters once
+        # migrate iterates many ids.
+        class _FakeNpz:
+            files = ["n1", "n2"]
+
+            def __getitem__(self, key):
+                return [0.1, 0.2, 0.3]
+
+        fake_npz = _FakeNpz()
+        (fresh_brain_path / "embeddings.npz").write_text("fake")
 
         # Create brain.db
-        from brain_sqlite import BrainSQLite
-        brain = BrainSQLite(base_path=tmp_path)
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
         brain._ensure_vector_store()
 
         with patch.object(np_mock, "load", return_value=fake_npz), \
              patch("embeddings._get_brain", return_value=brain):
             from embeddings import migrate_embeddings
-            migrate_embeddings(brain_path=tmp_path)
+            migrate_embeddings(brain_path=fresh_brain_path)
 
         # Verify ChromaDB received the embeddings (same brain instance)
         assert brain._chroma_collection.count() == 2
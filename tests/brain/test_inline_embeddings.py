@@ -9,22 +9,18 @@ import pytest
 class TestGenerateEmbedding:
     """BrainSQLite._generate_embedding()"""
 
-    def test_returns_none_without_sentence_transformers(self, tmp_path):
+    def test_returns_none_without_sentence_transformers(self, fresh_brain_path, BrainSQLiteCls):
         """Without sentence-transformers, _generate_embedding returns None."""
-        from brain_sqlite import BrainSQLite
-
-        brain = BrainSQLite(base_path=tmp_path / "brain")
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
 
         result = brain._generate_embedding("Test Title", "Test content", ["Episode"])
         # sentence_transformers is blocked in conftest.py, so this must be None
         assert result is None
 
-    def test_add_memory_works_without_deps(self, tmp_path):
+    def test_add_memory_works_without_deps(self, fresh_brain_path, BrainSQLiteCls):
         """add_memory() works normally when sentence-transformers is unavailable."""
-        from brain_sqlite import BrainSQLite
-
-        brain = BrainSQLite(base_path=tmp_path / "brain")
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
 
         node_id = brain.add_memory(
@@ -38,11 +34,9 @@ class TestGenerateEmbedding:
         assert node is not None
         assert "Episode" in node["labels"]
 
-    def test_explicit_embedding_is_used(self, tmp_path):
+    def test_explicit_embedding_is_used(self, fresh_brain_path, BrainSQLiteCls):
         """When embedding is passed explicitly, it is used (not overwritten)."""
-        from brain_sqlite import BrainSQLite
-
-        brain = BrainSQLite(base_path=tmp_path / "brain")
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
 
         fake_embedding = [0.1] * 10
@@ -57,11 +51,9 @@ class TestGenerateEmbedding:
         # The embedding should be stored
         assert brain._embedding_count() > 0
 
-    def test_model_cached_across_calls(self, tmp_path):
+    def test_model_cached_across_calls(self, fresh_brain_path, BrainSQLiteCls):
         """The embedding model attribute is set once and cached."""
-        from brain_sqlite import BrainSQLite
-
-        brain = BrainSQLite(base_path=tmp_path / "brain")
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
 
         # First call sets _embedding_model
@@ -73,11 +65,9 @@ class TestGenerateEmbedding:
         brain._generate_embedding("Title2", "Content2", ["Pattern"])
         assert brain._embedding_model is model_ref
 
-    def test_upsert_generates_embedding_too(self, tmp_path):
+    def test_upsert_generates_embedding_too(self, fresh_brain_path, BrainSQLiteCls):
         """_upsert_node also attempts embedding generation."""
-        from brain_sqlite import BrainSQLite
-
-        brain = BrainSQLite(base_path=tmp_path / "brain")
+        brain = BrainSQLiteCls(base_path=fresh_brain_path)
         brain.load()
 
         # First add
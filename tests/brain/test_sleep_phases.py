@@ -5,20 +5,35 @@ from datetime import datetime, timedelta
 
 import pytest
 
+from sleep import (
+    PHASE_ORDER,
+    phase_calibrate,
+    phase_connect,
+    phase_decay,
+    phase_dedup,
+    phase_gaps,
+    phase_insights,
+    phase_promote,
+    phase_relate,
+    phase_themes,
+    run_sleep,
+)
+
+# Single wall-clock read for the whole module — nothing in these tests
+# depends on timestamp precision, only on the fields being present.
+NOW_ISO = datetime.now().isoformat()
+
 
 class TestPhaseDedup:
     """sleep.phase_dedup()"""
 
     def test_no_duplicates_returns_zero(self, seeded_brain):
-        from sleep import phase_dedup
         stats = phase_dedup(seeded_brain)
         assert stats["merged"] == 0
 
     def test_merges_duplicate_titles(self, seeded_brain):
-        from sleep import phase_dedup
-
         # Add a duplicate of adr1 with same title but different ID
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         seeded_brain.graph.add_node(
             "dup_adr1",
             labels=["Decision", "ADR"],
@@ -31,9 +46,7 @@ class TestPhaseDedup:
         assert stats["merged"] >= 1
 
     def test_merges_by_prop_key(self, seeded_brain):
-        from sleep import phase_dedup
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         seeded_brain.graph.add_node(
             "dup_adr1_prop",
             labels=["Decision"],
@@ -46,9 +59,7 @@ class TestPhaseDedup:
         assert stats["merged"] >= 1
 
     def test_survivor_keeps_most_edges(self, seeded_brain):
-        from sleep import phase_dedup
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         # adr1 already has edges, dup has none -> adr1 should survive
         seeded_brain.graph.add_node(
             "dup_adr1",
@@ -67,8 +78,6 @@ class TestPhaseConnect:
     """sleep.phase_connect()"""
 
     def test_creates_reference_edges(self, seeded_brain):
-        from sleep import phase_connect
-
         # adr2 content mentions "[[ADR-001]]" but may not have edge yet
         # Let's ensure content has the ref
         seeded_brain.graph._nodes["adr2"]["props"]["content"] = "Use md5 hash. See [[ADR-001]]."
@@ -77,10 +86,8 @@ class TestPhaseConnect:
         assert stats["references"] >= 0  # May already exist
 
     def test_creates_same_scope_edges(self, seeded_brain):
-        from sleep import phase_connect
-
         # Add another commit with same scope
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         seeded_brain.graph.add_node(
             "commit2",
             labels=["Episode", "Commit"],
@@ -94,9 +101,7 @@ class TestPhaseConnect:
         assert stats["same_scope"] >= 1
 
     def test_creates_modifies_same_edges(self, seeded_brain):
-        from sleep import phase_connect
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         # commit1 modifies brain.py (scope="brain"); add another commit modifying
         # brain.py but with DIFFERENT scope so SAME_SCOPE doesn't preempt the edge
         seeded_brain.graph.add_node(
@@ -113,7 +118,6 @@ class TestPhaseConnect:
         assert stats["modifies_same"] >= 1
 
     def test_returns_stats_dict(self, seeded_brain):
-        from sleep import phase_connect
         stats = phase_connect(seeded_brain)
         assert "references" in stats
         assert "same_scope" in stats
@@ -124,13 +128,11 @@ class TestPhaseRelate:
     """sleep.phase_relate() — TF vector fallback only (no numpy)."""
 
     def test_returns_stats(self, seeded_brain):
-        from sleep import phase_relate
         stats = phase_relate(seeded_brain)
         assert "related_to" in stats
         assert "method" in stats
 
     def test_uses_tf_vectors_method(self, seeded_brain):
-        from sleep import phase_relate
         stats = phase_relate(seeded_brain)
         # Without real numpy/embeddings, should use tf_vectors
         assert stats["method"] in ("tf_vectors", "none")
@@ -140,15 +142,12 @@ class TestPhaseThemes:
     """sleep.phase_themes()"""
 
     def test_no_themes_for_few_commits(self, seeded_brain):
-        from sleep import phase_themes
         # Only 1 commit with scope "brain" — needs 3+
         stats = phase_themes(seeded_brain)
         assert stats["themes_created"] == 0
 
     def test_creates_theme_for_3plus_commits(self, seeded_brain):
-        from sleep import phase_themes
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         for i in range(3):
             seeded_brain.graph.add_node(
                 f"commit_theme_{i}",
@@ -164,7 +163,6 @@ class TestPhaseThemes:
         assert stats["edges_created"] >= 3
 
     def test_returns_stats_dict(self, seeded_brain):
-        from sleep import phase_themes
         stats = phase_themes(seeded_brain)
         assert "themes_created" in stats
         assert "clusters_created" in stats
@@ -175,14 +173,11 @@ class TestPhaseCalibrate:
     """sleep.phase_calibrate()"""
 
     def test_returns_stats(self, seeded_brain):
-        from sleep import phase_calibrate
         stats = phase_calibrate(seeded_brain)
         assert "boosted" in stats
         assert "decayed" in stats
 
     def test_boosts_frequently_accessed_edges(self, seeded_brain):
-        from sleep import phase_calibrate
-
         # Make both endpoints highly accessed
         seeded_brain.graph._nodes["adr1"]["memory"]["access_count"] = 10
         seeded_brain.graph._nodes["pat1"]["memory"]["access_count"] = 10
@@ -194,8 +189,6 @@ class TestPhaseCalibrate:
         assert new_weight > old_weight
 
     def test_decays_never_accessed_edges(self, seeded_brain):
-        from sleep import phase_calibrate
-
         # Make endpoints never accessed with semantic edge
         seeded_brain.graph._nodes["pat1"]["memory"]["access_count"] = 0
         seeded_brain.graph._nodes["adr1"]["memory"]["access_count"] = 0
@@ -210,14 +203,11 @@ class TestPhasePromote:
     """sleep.phase_promote()"""
 
     def test_no_promotions_by_default(self, seeded_brain):
-        from sleep import phase_promote
         stats = phase_promote(seeded_brain)
         assert stats["promoted"] == 0
 
     def test_promotes_highly_accessed_episode(self, seeded_brain):
-        from sleep import phase_promote
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         # Create episode with high access, high strength, and 3+ semantic edges
         seeded_brain.graph.add_node(
             "ep_hot",
@@ -240,13 +230,11 @@ class TestPhasePromote:
         assert "Episode" in node["labels"]  # keeps original
 
     def test_skips_already_concept(self, seeded_brain):
-        from sleep import phase_promote
         # concept1 is already a Concept — should not be promoted again
         stats = phase_promote(seeded_brain)
         assert stats["promoted"] == 0
 
     def test_returns_stats(self, seeded_brain):
-        from sleep import phase_promote
         stats = phase_promote(seeded_brain)
         assert "promoted" in stats
         assert "candidates" in stats
@@ -256,14 +244,11 @@ class TestPhaseInsights:
     """sleep.phase_insights()"""
 
     def test_no_insights_without_related_edges(self, seeded_brain):
-        from sleep import phase_insights
         stats = phase_insights(seeded_brain)
         assert stats["clusters_found"] == 0
 
     def test_detects_unthemed_cluster(self, seeded_brain):
-        from sleep import phase_insights
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         # Create 3 connected nodes without a Theme
         for i in range(3):
             seeded_brain.graph.add_node(
@@ -281,7 +266,6 @@ class TestPhaseInsights:
         assert len(stats["suggestions"]) >= 1
 
     def test_returns_stats(self, seeded_brain):
-        from sleep import phase_insights
         stats = phase_insights(seeded_brain)
         assert "clusters_found" in stats
         assert "suggestions" in stats
@@ -291,9 +275,7 @@ class TestPhaseGaps:
     """sleep.phase_gaps()"""
 
     def test_finds_isolated_nodes(self, seeded_brain):
-        from sleep import phase_gaps
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         # Add a node with only AUTHORED_BY (structural) — it's "isolated" semantically
         seeded_brain.graph.add_node(
             "isolated1",
@@ -310,9 +292,7 @@ class TestPhaseGaps:
         assert "isolated1" in isolated_ids
 
     def test_finds_domains_without_patterns(self, seeded_brain):
-        from sleep import phase_gaps
-
-        now = datetime.now().isoformat()
+        now = NOW_ISO
         seeded_brain.graph.add_node(
             "domain_orphan",
             labels=["Domain"],
@@ -327,7 +307,6 @@ class TestPhaseGaps:
         assert "domain_orphan" in domain_ids
 
     def test_returns_stats(self, seeded_brain):
-        from sleep import phase_gaps
         stats = phase_gaps(seeded_brain)
         assert "isolated_count" in stats
         assert "gap_domains_count" in stats
@@ -337,24 +316,27 @@ class TestPhaseDecay:
     """sleep.phase_decay()"""
 
     def test_returns_decay_stats(self, seeded_brain):
-        from sleep import phase_decay
         stats = phase_decay(seeded_brain)
         assert "weak_count" in stats
         assert "archive_count" in stats
 
     def test_delegates_to_brain_apply_decay(self, seeded_brain):
-        from sleep import phase_decay
         # Just verify it runs without error and returns expected keys
         stats = phase_decay(seeded_brain)
         assert isinstance(stats, dict)
         assert "weak_nodes" in stats
 
 
+@pytest.mark.slow
+@pytest.mark.xdist_group("sleep_integration")
 class TestRunSleep:
-    """sleep.run_sleep() orchestrator."""
+    """sleep.run_sleep() orchestrator.
+
+    Each test drives every phase in PHASE_ORDER, so the class is marked
+    slow and pinned to one xdist worker under --dist=loadgroup.
+    """
 
     def test_runs_all_default_phases(self, seeded_brain):
-        from sleep import run_sleep, PHASE_ORDER
         results = run_sleep(seeded_brain)
         assert "phases" in results
         for phase in PHASE_ORDER:
@@ -363,21 +345,18 @@ class TestRunSleep:
         assert "dedup" not in results["phases"]
 
     def test_runs_specific_phases(self, seeded_brain):
-        from sleep import run_sleep
         results = run_sleep(seeded_brain, phases=["dedup", "calibrate"])
         assert "dedup" in results["phases"]
         assert "calibrate" in results["phases"]
         assert "connect" not in results["phases"]
 
     def test_reports_delta(self, seeded_brain):
-        from sleep import run_sleep
         results = run_sleep(seeded_brain)
         assert "before" in results
         assert "after" in results
         assert "delta" in results
 
     def test_reports_actionable(self, seeded_brain):
-        from sleep import run_sleep
         results = run_sleep(seeded_brain)
         assert "actionable" in results
         assert isinstance(results["actionable"], list)